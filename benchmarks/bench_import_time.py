@@ -0,0 +1,83 @@
+"""
+Import time of the app entry points, and the one-off cost of the text frontend.
+
+Each module is imported in a fresh interpreter with `-X importtime`, and
+the cumulative import time of the module and of its heaviest dependencies
+is reported. espeak and the normalizer are set up on first use, so the
+first `phonemize_with_dict` call is timed separately.
+
+Run from the repository root:
+    python -m benchmarks.bench_import_time
+"""
+import argparse
+import subprocess
+import sys
+import time
+
+
+MODULES = ["utils.phonemize_text", "vieneu_tts", "gradio_user"]
+WATCHED = ["utils.phonemize_text", "phonemizer", "utils.normalize_text", "torch", "gradio", "vieneu_tts"]
+
+FIRST_USE = r"""
+import time
+from utils.phonemize_text import phonemize_with_dict
+start = time.perf_counter()
+phonemize_with_dict("Xin chào, hôm nay là ngày 15/3/2025.")
+first = time.perf_counter() - start
+start = time.perf_counter()
+phonemize_with_dict("Xin chào, hôm nay là ngày 16/3/2025.")
+print(first, time.perf_counter() - start)
+"""
+
+
+def import_times(module: str) -> tuple[float, dict[str, float]]:
+    """Wall time of `import module` in a fresh interpreter and cumulative import times (s)"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if cum.isdigit():
+            cumulative.setdefault(name, int(cum) / 1e6)
+    return wall, cumulative
+
+
+def main(modules: list[str]):
+    for module in modules:
+        try:
+            wall, cumulative = import_times(module)
+        except RuntimeError as e:
+            print(f"{module}: {e}\n")
+            continue
+        print(f"import {module}: {wall * 1e3:8.1f} ms wall (interpreter included)")
+        for name in WATCHED:
+            if name in cumulative:
+                print(f"  {name:<22} {cumulative[name] * 1e3:8.1f} ms")
+        print(f"  {'phonemizer loaded':<22} {'yes' if 'phonemizer' in cumulative else 'no'}\n")
+
+    result = subprocess.run([sys.executable, "-c", FIRST_USE], capture_output=True, text=True)
+    if result.returncode == 0:
+        first, second = map(float, result.stdout.split()[-2:])
+        print(f"first phonemize_with_dict call: {first * 1e3:8.1f} ms (espeak + normalizer setup)")
+        print(f"next call:                      {second * 1e3:8.1f} ms")
+    else:
+        print(f"phonemize_with_dict failed:\n{result.stderr[-2000:]}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark import time of the app entry points")
+    parser.add_argument("modules", nargs="*", default=MODULES, help="Modules to import.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args().modules)
@@ -0,0 +1,96 @@
+"""
+Transformers generation: one chunk at a time vs left-padded batches.
+
+Builds the prompt of every chunk of a document for one reference voice and
+checks that a left-padded forward pass, with positions taken from the
+attention mask as `generate` does, gives the same logits at every prompt
+position as each prompt on its own. Then samples every chunk with
+`VieNeuTTS._infer_torch_batch` on CPU:
+  - sequential: one `generate` call per chunk
+  - batched: one `generate` call per `--batch-size` chunks (as `infer_batch`)
+and reports generated speech tokens per second.
+
+Run from the repository root:
+    python -m benchmarks.bench_infer_batch --backbone pnnbao-ump/VieNeu-TTS
+"""
+import argparse
+import time
+from types import SimpleNamespace
+import torch
+from transformers import AutoTokenizer, AutoModelForCausalLM
+import vieneu_tts.vieneu_tts as vt
+from utils.core_utils import split_text_into_chunks
+
+
+DOCUMENT = (
+    "Hà Nội là thủ đô của Việt Nam, nằm ở trung tâm đồng bằng sông Hồng. "
+    "Thành phố có lịch sử hơn một nghìn năm, với nhiều di tích và danh lam thắng cảnh. "
+    "Hồ Hoàn Kiếm, Văn Miếu và phố cổ là những điểm đến quen thuộc của du khách. "
+    "Ẩm thực Hà Nội nổi tiếng với phở, bún chả và bánh cuốn. "
+    "Mùa thu là thời điểm đẹp nhất trong năm, khi tiết trời se lạnh và hoa sữa nở khắp phố. "
+    "Ngày nay, thành phố không ngừng phát triển nhưng vẫn giữ được nét cổ kính vốn có."
+)
+
+
+def max_padded_logit_error(model, prompts: list[list[int]], pad_id: int) -> float:
+    """Largest logit difference between a left-padded batch and each prompt alone"""
+    input_ids, attention_mask = vt._left_pad(prompts, pad_id)
+    position_ids = attention_mask.cumsum(-1) - 1
+    position_ids.masked_fill_(attention_mask == 0, 1)
+    padded = model(input_ids, attention_mask=attention_mask, position_ids=position_ids).logits
+    width = input_ids.shape[1]
+    error = 0.0
+    for row, prompt_ids in enumerate(prompts):
+        single = model(torch.tensor([prompt_ids])).logits[0]
+        error = max(error, (padded[row, width - len(prompt_ids):] - single).abs().max().item())
+    return error
+
+
+def sample(engine, prompts: list[list[int]], batch_size: int) -> tuple[float, int]:
+    """Seconds and speech tokens generated for all prompts, `batch_size` per generate call"""
+    torch.manual_seed(0)
+    n_tokens = 0
+    start = time.perf_counter()
+    for i in range(0, len(prompts), batch_size):
+        n_tokens += sum(map(len, vt.VieNeuTTS._infer_torch_batch(engine, prompts[i:i + batch_size])))
+    return time.perf_counter() - start, n_tokens
+
+
+def main(backbone: str, voice_codes: str, ref_text: str, max_chars: int, batch_size: int):
+    torch.set_grad_enabled(False)
+    tokenizer = AutoTokenizer.from_pretrained(backbone)
+    model = AutoModelForCausalLM.from_pretrained(backbone).eval()
+    ref_codes = torch.load(voice_codes, map_location="cpu")
+
+    builder = vt._PromptBuilder.from_transformers(tokenizer, vt._build_speech_token_table(tokenizer))
+    engine = SimpleNamespace(tokenizer=tokenizer, _prompt_builder=builder, backbone=model, max_context=2048)
+    pad_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else builder.speech_end_id
+    prompts = [builder.build(ref_codes, ref_text, chunk) for chunk in split_text_into_chunks(DOCUMENT, max_chars)]
+    prompts.sort(key=len)
+    print(f"{len(prompts)} chunks, prompts {len(prompts[0])}-{len(prompts[-1])} tokens, batch size {batch_size}\n")
+
+    error = max(max_padded_logit_error(model, prompts[i:i + batch_size], pad_id)
+                for i in range(0, len(prompts), batch_size))
+    print(f"max logit difference, left-padded vs single: {error:.2e}\n")
+
+    sequential, sequential_tokens = sample(engine, prompts, 1)
+    batched, batched_tokens = sample(engine, prompts, batch_size)
+    print(f"sequential: {sequential_tokens / sequential:8.1f} tokens/s  ({sequential:.2f} s, {sequential_tokens} tokens)")
+    print(f"batched:    {batched_tokens / batched:8.1f} tokens/s  ({batched:.2f} s, {batched_tokens} tokens)")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark batched transformers generation")
+    parser.add_argument("--backbone", default="pnnbao-ump/VieNeu-TTS", help="Backbone repository (transformers).")
+    parser.add_argument("--voice-codes", default="./sample/Vĩnh (nam miền Nam).pt", help="Reference codes.")
+    parser.add_argument("--voice-text", default="./sample/Vĩnh (nam miền Nam).txt", help="Reference transcript file.")
+    parser.add_argument("--max-chars", type=int, default=128, help="Characters per chunk.")
+    parser.add_argument("--batch-size", type=int, default=4, help="Chunks per generate call.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    with open(args.voice_text, "r", encoding="utf-8") as f:
+        ref_text = f.read().strip()
+    main(args.backbone, args.voice_codes, ref_text, args.max_chars, args.batch_size)
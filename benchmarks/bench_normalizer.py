@@ -0,0 +1,125 @@
+"""
+Text normalization throughput: per-unit regex passes vs the compiled unit matcher.
+
+Normalizes a corpus of unit-heavy and plain sentences with the original
+`_normalize_units` (one `re.sub` per unit, table sorted on every call)
+and with the current one, and reports chars/sec for the unit pass alone
+and for the whole `normalize`. Both outputs are checked to be identical.
+Then profiles `normalize_many` over the corpus and prints the time spent
+in each pipeline stage.
+
+Run from the repository root:
+    python -m benchmarks.bench_normalizer
+"""
+import argparse
+import re
+import time
+from utils.normalize_text import VietnameseTTSNormalizer
+
+
+CORPUS = [
+    "Giá 2.500.000đ (giảm 50%), mua trước 14h30 ngày 15/12/2025",
+    "Liên hệ: 0912-345-678 hoặc email@example.com",
+    "Tốc độ 120km/h, trọng lượng 75kg",
+    "Nhiệt độ 36,5°C, độ ẩm 80%",
+    "Điện áp 220V, công suất 2.5kW, tần số 50Hz",
+    "Cần 5l nước cho công thức này",
+    "Vận tốc ánh sáng 299792km/s",
+    "Mật độ dân số 450 người/km2",
+    "Công suất 100 W/m2",
+    "Căn hộ rộng 85 m², trần cao 3,2 m, bể nước 2 m³ trên mái.",
+    "Áp suất lốp 2,2 bar, tương đương 32 psi hoặc 220 kPa.",
+    "Mỗi khẩu phần cung cấp 250 kcal, 12 g đạm và 300 mg natri.",
+    "Hôm nay trời nắng đẹp, mọi người cùng nhau đi dạo quanh hồ và trò chuyện vui vẻ.",
+    "Thành phố đang triển khai nhiều dự án giao thông công cộng nhằm giảm ùn tắc giờ cao điểm.",
+]
+
+
+def original_normalize_units(self, text):
+    """The original VietnameseTTSNormalizer._normalize_units"""
+    def expand_compound_with_number(match):
+        number = match.group(1)
+        unit1 = match.group(2).lower()
+        unit2 = match.group(3).lower()
+        full_unit1 = self.units.get(unit1, unit1)
+        full_unit2 = self.units.get(unit2, unit2)
+        return f"{number} {full_unit1} trên {full_unit2}"
+
+    def expand_compound_without_number(match):
+        unit1 = match.group(1).lower()
+        unit2 = match.group(2).lower()
+        full_unit1 = self.units.get(unit1, unit1)
+        full_unit2 = self.units.get(unit2, unit2)
+        return f"{full_unit1} trên {full_unit2}"
+
+    text = re.sub(r'(\d+(?:[.,]\d+)?)\s*([a-zA-Zμµ²³°]+)/([a-zA-Zμµ²³°0-9]+)\b',
+                  expand_compound_with_number, text)
+    text = re.sub(r'\b([a-zA-Zμµ²³°]+)/([a-zA-Zμµ²³°0-9]+)\b',
+                  expand_compound_without_number, text)
+
+    sorted_units = sorted(self.units.items(), key=lambda x: len(x[0]), reverse=True)
+    for unit, full_name in sorted_units:
+        pattern = r'(\d+(?:[.,]\d+)?)\s*' + re.escape(unit) + r'\b'
+        text = re.sub(pattern, rf'\1 {full_name}', text, flags=re.IGNORECASE)
+
+    for unit, full_name in sorted_units:
+        if any(c in unit for c in '²³°'):
+            pattern = r'\b' + re.escape(unit) + r'\b'
+            text = re.sub(pattern, full_name, text, flags=re.IGNORECASE)
+
+    return text
+
+
+class OriginalUnitsNormalizer(VietnameseTTSNormalizer):
+    _normalize_units = original_normalize_units
+
+
+def chars_per_sec(fn, texts: list[str], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            fn(text)
+    return rounds * sum(map(len, texts)) / (time.perf_counter() - start)
+
+
+def main(rounds: int):
+    new = VietnameseTTSNormalizer()
+    old = OriginalUnitsNormalizer()
+
+    texts = [text.lower() for text in CORPUS]
+    for text in CORPUS:
+        if old.normalize(text) != new.normalize(text):
+            raise AssertionError(f"Normalized text differs for: {text}")
+    print(f"✅ Outputs match on {len(CORPUS)} sentences\n")
+
+    for label, old_fn, new_fn in (
+        ("_normalize_units", old._normalize_units, new._normalize_units),
+        ("normalize", old.normalize, new.normalize),
+    ):
+        before = chars_per_sec(old_fn, texts, rounds)
+        after = chars_per_sec(new_fn, texts, rounds)
+        print(f"{label}:")
+        print(f"  per-unit passes:  {before / 1e3:8.1f} k chars/s")
+        print(f"  compiled matcher: {after / 1e3:8.1f} k chars/s  ({after / before:.1f}x)")
+
+    profiled = VietnameseTTSNormalizer(profile=True)
+    if profiled.normalize_many(CORPUS) != [new.normalize(text) for text in CORPUS]:
+        raise AssertionError("normalize_many differs from normalize")
+    profiled.reset_stage_stats()
+    for _ in range(rounds):
+        profiled.normalize_many(CORPUS)
+    stats = profiled.get_stage_stats()
+    total = sum(stage['seconds'] for stage in stats.values())
+    print(f"\nnormalize_many stages ({total * 1e3:.1f} ms total):")
+    for name, stage in stats.items():
+        print(f"  {name:<16} {stage['seconds'] * 1e3:8.1f} ms  {100 * stage['seconds'] / total:5.1f}%")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark VietnameseTTSNormalizer throughput")
+    parser.add_argument("--rounds", type=int, default=200, help="Rounds over the corpus.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args().rounds)
@@ -0,0 +1,135 @@
+"""
+Number reading: recursive string building vs precomputed three-digit tables.
+
+First checks the table-driven `_convert_number_to_words` against the
+original recursive one on every number in [0, --exhaustive), on random
+numbers up to a trillion and on the values around each group boundary.
+Then reports numbers/sec on e-commerce style prices, and chars/sec of the
+`number_to_words` stage on price-heavy text.
+
+Run from the repository root:
+    python -m benchmarks.bench_number_words
+"""
+import argparse
+import random
+import time
+from utils.normalize_text import VietnameseTTSNormalizer
+
+
+def original_convert_number_to_words(self, num):
+    """The original VietnameseTTSNormalizer._convert_number_to_words"""
+    if num == 0:
+        return "không"
+
+    if num < 0:
+        return f"âm {original_convert_number_to_words(self, -num)}"
+
+    if num >= 1000000000:
+        billion = num // 1000000000
+        remainder = num % 1000000000
+        result = f"{self._read_three_digits(billion)} tỷ"
+        if remainder > 0:
+            result += f" {original_convert_number_to_words(self, remainder)}"
+        return result
+
+    elif num >= 1000000:
+        million = num // 1000000
+        remainder = num % 1000000
+        result = f"{self._read_three_digits(million)} triệu"
+        if remainder > 0:
+            result += f" {original_convert_number_to_words(self, remainder)}"
+        return result
+
+    elif num >= 1000:
+        thousand = num // 1000
+        remainder = num % 1000
+        result = f"{self._read_three_digits(thousand)} nghìn"
+        if remainder > 0:
+            if remainder < 100:
+                result += f" không trăm {self._read_two_digits(remainder)}"
+            else:
+                result += f" {self._read_three_digits(remainder)}"
+        return result
+
+    else:
+        return self._read_three_digits(num)
+
+
+class OriginalNumberNormalizer(VietnameseTTSNormalizer):
+    _convert_number_to_words = original_convert_number_to_words
+
+
+def check_numbers(old, new, numbers) -> int:
+    count = 0
+    for num in numbers:
+        if old._convert_number_to_words(num) != new._convert_number_to_words(num):
+            raise AssertionError(f"Readings differ for {num}")
+        count += 1
+    return count
+
+
+def boundary_numbers():
+    for scale in (10, 100, 1000, 10**4, 10**5, 10**6, 10**7, 10**8, 10**9, 10**10, 10**11):
+        for base in (scale, 2 * scale, 5 * scale):
+            yield from range(base - 3, base + 4)
+            for low in (1, 5, 10, 15, 21, 99, 100, 105, 999):
+                yield base + low
+    yield 10**12 - 1
+
+
+def price_texts(rng: random.Random, n: int) -> list[str]:
+    texts = []
+    for _ in range(n):
+        prices = [str(rng.choice([rng.randint(1, 999) * 1000, rng.randint(1, 99) * 10**6 + rng.randint(0, 999) * 1000,
+                                  rng.randint(0, 9999)])) for _ in range(6)]
+        texts.append(f"giá gốc {prices[0]} đồng giảm còn {prices[1]} đồng mua {prices[2]} tặng {prices[3]} "
+                     f"còn {prices[4]} sản phẩm đã bán {prices[5]}")
+    return texts
+
+
+def per_sec(fn, items, rounds: int) -> float:
+    """Items (numbers, or chars of texts) processed per second"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for item in items:
+            fn(item)
+    elapsed = time.perf_counter() - start
+    return rounds * sum(len(item) if isinstance(item, str) else 1 for item in items) / elapsed
+
+
+def main(exhaustive: int, samples: int, rounds: int):
+    old = OriginalNumberNormalizer()
+    new = VietnameseTTSNormalizer()
+    rng = random.Random(0)
+
+    checked = check_numbers(old, new, range(exhaustive))
+    checked += check_numbers(old, new, (rng.randrange(10**12) for _ in range(samples)))
+    checked += check_numbers(old, new, (rng.randrange(10**k) for k in range(1, 13) for _ in range(samples // 12)))
+    checked += check_numbers(old, new, boundary_numbers())
+    checked += check_numbers(old, new, (-n for n in range(0, 10**6, 997)))
+    print(f"✅ Readings match on {checked} numbers (all of [0, {exhaustive}))\n")
+
+    texts = price_texts(rng, 200)
+    numbers = [int(word) for text in texts for word in text.split() if word.isdigit()]
+    for name, items, unit in (
+        ("_convert_number_to_words", numbers, "numbers"),
+        ("_number_to_words", texts, "chars"),
+    ):
+        before = per_sec(getattr(old, name), items, rounds)
+        after = per_sec(getattr(new, name), items, rounds)
+        print(f"{name}:")
+        print(f"  recursive: {before / 1e3:8.1f} k {unit}/s")
+        print(f"  tables:    {after / 1e3:8.1f} k {unit}/s  ({after / before:.1f}x)")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark Vietnamese number reading")
+    parser.add_argument("--exhaustive", type=int, default=2_000_000, help="Check every number below this.")
+    parser.add_argument("--samples", type=int, default=200_000, help="Random numbers checked up to a trillion.")
+    parser.add_argument("--rounds", type=int, default=20, help="Rounds over the price corpus.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(args.exhaustive, args.samples, args.rounds)
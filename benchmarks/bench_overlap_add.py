@@ -0,0 +1,66 @@
+"""
+Per-chunk cost of streaming overlap-add: full recompute vs StreamingOverlapAdd.
+
+Run from the repository root:
+    python -m benchmarks.bench_overlap_add --chunks 1000
+"""
+import argparse
+import time
+import numpy as np
+from vieneu_tts.vieneu_tts import _linear_overlap_add, StreamingOverlapAdd
+
+
+HOP_LENGTH = 480
+FRAMES_PER_CHUNK = 25
+OVERLAP_FRAMES = 1
+
+
+def run(n_chunks: int, report_every: int):
+    stride = FRAMES_PER_CHUNK * HOP_LENGTH
+    frame_length = (FRAMES_PER_CHUNK + 2 * OVERLAP_FRAMES) * HOP_LENGTH
+    rng = np.random.default_rng(0)
+    frames = [rng.standard_normal(frame_length).astype(np.float32) for _ in range(n_chunks)]
+
+    audio_cache: list[np.ndarray] = []
+    n_decoded_samples = 0
+    streamer = StreamingOverlapAdd(stride=stride)
+    old_times, new_times = [], []
+
+    print(f"{'chunk':>8} {'audio (s)':>10} {'recompute (ms)':>16} {'streaming (ms)':>16}")
+    for i, frame in enumerate(frames, start=1):
+        start = time.perf_counter()
+        audio_cache.append(frame)
+        processed = _linear_overlap_add(audio_cache, stride=stride)
+        new_samples_end = len(audio_cache) * stride
+        expected = processed[n_decoded_samples:new_samples_end]
+        n_decoded_samples = new_samples_end
+        old_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        chunk = streamer.push(frame)
+        new_times.append(time.perf_counter() - start)
+
+        if not np.array_equal(chunk, expected):
+            raise AssertionError(f"Streaming output differs from recompute at chunk {i}")
+
+        if i % report_every == 0:
+            window = slice(i - report_every, i)
+            print(
+                f"{i:>8} {i * stride / 24_000:>10.1f} "
+                f"{np.mean(old_times[window]) * 1e3:>16.3f} "
+                f"{np.mean(new_times[window]) * 1e3:>16.3f}"
+            )
+
+    print(f"\nTotal recompute: {sum(old_times):.2f}s, streaming: {sum(new_times):.2f}s")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark streaming overlap-add")
+    parser.add_argument("--chunks", type=int, default=1000, help="Number of streamed chunks.")
+    parser.add_argument("--report-every", type=int, default=100, help="Print averages every N chunks.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    run(args.chunks, args.report_every)
@@ -0,0 +1,117 @@
+"""
+Phoneme dictionary: JSON parsed per process vs compiled mmap table.
+
+Each variant runs in a fresh subprocess, which reports:
+  - load time (import + first lookup)
+  - lookup time per word
+  - RSS growth, and how much of it is private to the process (pages of
+    the mmap'd table are shared between workers through the page cache)
+
+The compiled table is built into a temporary directory first, and every
+lookup is checked against the JSON dictionary.
+
+Run from the repository root:
+    python -m benchmarks.bench_phoneme_dict
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+from utils.phoneme_store import compile_phoneme_dict, PhonemeDict
+
+
+PHONEME_DICT_PATH = os.path.join("utils", "phoneme_dict.json")
+
+CHILD = r"""
+import json, sys, time
+
+def memory_kb():
+    fields = {}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[1].isdigit():
+                    fields[parts[0].rstrip(":")] = int(parts[1])
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, None
+    return fields.get("Rss", 0), fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+
+mode, json_path, bin_path, words_path = sys.argv[1:5]
+with open(words_path, encoding="utf-8") as f:
+    words = f.read().split("\n")
+rss_before, private_before = memory_kb()
+
+start = time.perf_counter()
+if mode == "json":
+    with open(json_path, encoding="utf-8") as f:
+        phoneme_dict = json.load(f)
+else:
+    from utils.phoneme_store import PhonemeDict
+    phoneme_dict = PhonemeDict(json_path, bin_path)
+    assert phoneme_dict.is_compiled
+"xin" in phoneme_dict
+load = time.perf_counter() - start
+
+start = time.perf_counter()
+for word in words:
+    phoneme_dict[word]
+lookup = (time.perf_counter() - start) / len(words)
+
+rss_after, private_after = memory_kb()
+print(json.dumps({
+    "load": load,
+    "lookup": lookup,
+    "rss_kb": rss_after - rss_before,
+    "private_kb": None if private_before is None else private_after - private_before,
+}))
+"""
+
+
+def run(mode: str, json_path: str, bin_path: str, words_path: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, mode, json_path, bin_path, words_path],
+        check=True, capture_output=True, text=True, cwd=os.getcwd(),
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(json_path: str, n_lookups: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        bin_path = os.path.join(tmp, "phoneme_dict.bin")
+        count = compile_phoneme_dict(json_path, bin_path)
+        print(f"{count} entries: JSON {os.path.getsize(json_path) / 1024:.0f} KB, "
+              f"compiled {os.path.getsize(bin_path) / 1024:.0f} KB\n")
+
+        with open(json_path, encoding="utf-8") as f:
+            expected = json.load(f)
+        compiled = PhonemeDict(json_path, bin_path)
+        if any(compiled[word] != phones for word, phones in expected.items()):
+            raise AssertionError("Compiled table differs from the JSON dictionary")
+        print("✅ Compiled table matches the JSON dictionary\n")
+
+        words_path = os.path.join(tmp, "words.txt")
+        with open(words_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(random.Random(0).choices(list(expected), k=n_lookups)))
+
+        for mode in ("json", "compiled"):
+            stats = run(mode, json_path, bin_path, words_path)
+            private = f"{stats['private_kb'] / 1024:6.1f} MB private" if stats["private_kb"] is not None else ""
+            print(f"{mode:>8}: load {stats['load'] * 1e3:7.1f} ms, lookup {stats['lookup'] * 1e6:5.2f} µs, "
+                  f"RSS +{stats['rss_kb'] / 1024:6.1f} MB {private}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark phoneme dictionary formats")
+    parser.add_argument("--json", default=PHONEME_DICT_PATH, help="JSON phoneme dictionary.")
+    parser.add_argument("--lookups", type=int, default=100_000, help="Random lookups per variant.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(args.json, args.lookups)
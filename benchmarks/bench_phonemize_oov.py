@@ -0,0 +1,92 @@
+"""
+Out-of-dictionary phonemization: one espeak call per word vs one batched call.
+
+Phonemizes OOV-heavy texts (English names, brands, rare words) with an
+empty OOV cache every round, so every unknown word hits espeak, and
+reports the time per text. The batched output is checked against the
+original per-word loop.
+
+Run from the repository root:
+    python -m benchmarks.bench_phonemize_oov
+"""
+import argparse
+import time
+from phonemizer import phonemize
+import utils.phonemize_text as pt
+from utils.phoneme_store import OOVPhonemeCache
+
+
+TEXTS = [
+    "Microsoft, Google và Amazon công bố hợp tác với OpenAI trong dự án Stargate.",
+    "Cristiano Ronaldo và Lionel Messi từng thi đấu tại Champions League nhiều mùa giải.",
+    "Apple ra mắt iPhone, MacBook và Vision Pro tại sự kiện WWDC ở Cupertino.",
+    "Nhóm nghiên cứu dùng PyTorch, TensorFlow và Kubernetes để huấn luyện transformer.",
+]
+
+
+def original_phonemize_with_dict(text: str, phoneme_dict) -> str:
+    """The original phonemize_with_dict: one espeak call per unknown word"""
+    text = pt.normalizer.normalize(text)
+    result = []
+    for word in text.split():
+        if word in phoneme_dict:
+            phone_word = phoneme_dict[word]
+        else:
+            try:
+                phone_word = phonemize(
+                    word,
+                    language='vi',
+                    backend='espeak',
+                    preserve_punctuation=True,
+                    with_stress=True,
+                    language_switch='remove-flags'
+                )
+                if word.lower().startswith('r'):
+                    phone_word = 'ɹ' + phone_word[1:]
+                phoneme_dict[word] = phone_word
+            except Exception as e:
+                print(f"Warning: Could not phonemize '{word}': {e}")
+                phone_word = word
+        result.append(phone_word)
+    return ' '.join(result)
+
+
+def batched_phonemize_with_dict(text: str, phoneme_dict) -> str:
+    return pt.phonemize_with_dict(text, phoneme_dict, oov_cache=OOVPhonemeCache(None))
+
+
+def time_per_text(fn, rounds: int) -> float:
+    base = dict(pt.phoneme_dict)
+    total = 0.0
+    for _ in range(rounds):
+        for text in TEXTS:
+            phoneme_dict = dict(base)  # fresh copy and OOV cache: unknown words always hit espeak
+            start = time.perf_counter()
+            fn(text, phoneme_dict)
+            total += time.perf_counter() - start
+    return total / (rounds * len(TEXTS))
+
+
+def main(rounds: int):
+    base = dict(pt.phoneme_dict)
+    for text in TEXTS:
+        n_oov = len({w for w in pt.normalizer.normalize(text).split() if w not in base})
+        print(f"{n_oov:3d} OOV words: {text[:60]}")
+        if batched_phonemize_with_dict(text, base) != original_phonemize_with_dict(text, dict(base)):
+            raise AssertionError(f"Batched phonemes differ from the per-word loop for: {text}")
+    print("✅ Batched output matches the per-word loop\n")
+
+    old = time_per_text(original_phonemize_with_dict, rounds)
+    new = time_per_text(batched_phonemize_with_dict, rounds)
+    print(f"per-word espeak calls: {old * 1e3:8.1f} ms/text")
+    print(f"batched espeak call:   {new * 1e3:8.1f} ms/text  ({old / new:.1f}x)")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark OOV phonemization")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds over the text set.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args().rounds)
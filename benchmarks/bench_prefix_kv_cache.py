@@ -0,0 +1,80 @@
+"""
+Transformers prefill: full prompt vs _PrefixKVCache on a multi-chunk document.
+
+Splits a document into chunks the way long-form synthesis does, builds the
+prompt of every chunk for one reference voice and times the prefill (one
+forward pass over the prompt) on CPU:
+  - without cache: the whole prompt every chunk
+  - with cache: a copy of the voice prefix cache, then the rest of the prompt
+The last-position logits of both runs are checked to match.
+
+Run from the repository root:
+    python -m benchmarks.bench_prefix_kv_cache --backbone pnnbao-ump/VieNeu-TTS
+"""
+import argparse
+import time
+import torch
+from transformers import AutoTokenizer, AutoModelForCausalLM
+import vieneu_tts.vieneu_tts as vt
+from utils.core_utils import split_text_into_chunks
+
+
+DOCUMENT = (
+    "Hà Nội là thủ đô của Việt Nam, nằm ở trung tâm đồng bằng sông Hồng. "
+    "Thành phố có lịch sử hơn một nghìn năm, với nhiều di tích và danh lam thắng cảnh. "
+    "Hồ Hoàn Kiếm, Văn Miếu và phố cổ là những điểm đến quen thuộc của du khách. "
+    "Ẩm thực Hà Nội nổi tiếng với phở, bún chả và bánh cuốn. "
+    "Mùa thu là thời điểm đẹp nhất trong năm, khi tiết trời se lạnh và hoa sữa nở khắp phố. "
+    "Ngày nay, thành phố không ngừng phát triển nhưng vẫn giữ được nét cổ kính vốn có."
+)
+
+
+@torch.no_grad()
+def prefill(model, prompt_ids: list[int], past_key_values=None, n_cached: int = 0) -> torch.Tensor:
+    input_ids = torch.tensor(prompt_ids[n_cached:]).unsqueeze(0)
+    out = model(input_ids, past_key_values=past_key_values, use_cache=True)
+    return out.logits[0, -1]
+
+
+def main(backbone: str, voice_codes: str, ref_text: str, max_chars: int):
+    torch.set_grad_enabled(False)
+    tokenizer = AutoTokenizer.from_pretrained(backbone)
+    model = AutoModelForCausalLM.from_pretrained(backbone).eval()
+    ref_codes = torch.load(voice_codes, map_location="cpu")
+
+    builder = vt._PromptBuilder.from_transformers(tokenizer, vt._build_speech_token_table(tokenizer))
+    prefix_ids, _ = builder.voice(ref_codes, ref_text)
+    prompts = [builder.build(ref_codes, ref_text, chunk) for chunk in split_text_into_chunks(DOCUMENT, max_chars)]
+    print(f"{len(prompts)} chunks, prefix {len(prefix_ids)} tokens, "
+          f"prompts {min(map(len, prompts))}-{max(map(len, prompts))} tokens\n")
+
+    start = time.perf_counter()
+    full_logits = [prefill(model, prompt) for prompt in prompts]
+    full = time.perf_counter() - start
+
+    cache = vt._PrefixKVCache(model)
+    start = time.perf_counter()
+    cached_logits = [prefill(model, prompt, cache.get(prefix_ids), len(prefix_ids)) for prompt in prompts]
+    cached = time.perf_counter() - start
+
+    max_err = max((a - b).abs().max().item() for a, b in zip(full_logits, cached_logits))
+    print(f"without cache: {full * 1e3 / len(prompts):8.1f} ms/chunk  ({full:.2f} s total)")
+    print(f"with cache:    {cached * 1e3 / len(prompts):8.1f} ms/chunk  ({cached:.2f} s total, {full / cached:.2f}x)")
+    print(f"max logit difference: {max_err:.2e}")
+    print(f"\nPrefix cache: {cache.stats()}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark prefix past_key_values reuse")
+    parser.add_argument("--backbone", default="pnnbao-ump/VieNeu-TTS", help="Backbone repository (transformers).")
+    parser.add_argument("--voice-codes", default="./sample/Vĩnh (nam miền Nam).pt", help="Reference codes.")
+    parser.add_argument("--voice-text", default="./sample/Vĩnh (nam miền Nam).txt", help="Reference transcript file.")
+    parser.add_argument("--max-chars", type=int, default=128, help="Characters per chunk.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    with open(args.voice_text, "r", encoding="utf-8") as f:
+        ref_text = f.read().strip()
+    main(args.backbone, args.voice_codes, ref_text, args.max_chars)
@@ -0,0 +1,97 @@
+"""
+Transformers prompt construction: original chat template vs _PromptBuilder.
+
+Builds the prompt for a set of sentences with one reference voice and
+reports the cost per prompt, with and without phonemization. The builder
+output is checked token-for-token against the original template code.
+
+Run from the repository root:
+    python -m benchmarks.bench_prompt_builder --backbone pnnbao-ump/VieNeu-TTS
+"""
+import argparse
+import time
+import torch
+from transformers import AutoTokenizer
+import vieneu_tts.vieneu_tts as vt
+from utils.phonemize_text import phonemize_with_dict
+
+
+SENTENCES = [
+    "Xin chào, tôi là trợ lý giọng nói tiếng Việt.",
+    "Hôm nay trời nắng đẹp, nhiệt độ khoảng 30 độ C.",
+    "Buổi họp sẽ bắt đầu lúc 9 giờ sáng ngày 15 tháng 3.",
+    "Giá vàng tăng 2,5% so với tuần trước.",
+]
+
+
+def original_chat_template(tokenizer, ref_codes, ref_text: str, input_text: str) -> list[int]:
+    """The original VieNeuTTS._apply_chat_template"""
+    input_text = vt.phonemize_with_dict(ref_text) + " " + vt.phonemize_with_dict(input_text)
+
+    speech_replace = tokenizer.convert_tokens_to_ids("<|SPEECH_REPLACE|>")
+    speech_gen_start = tokenizer.convert_tokens_to_ids("<|SPEECH_GENERATION_START|>")
+    text_replace = tokenizer.convert_tokens_to_ids("<|TEXT_REPLACE|>")
+    text_prompt_start = tokenizer.convert_tokens_to_ids("<|TEXT_PROMPT_START|>")
+    text_prompt_end = tokenizer.convert_tokens_to_ids("<|TEXT_PROMPT_END|>")
+
+    input_ids = tokenizer.encode(input_text, add_special_tokens=False)
+    chat = """user: Convert the text to speech:<|TEXT_REPLACE|>\nassistant:<|SPEECH_REPLACE|>"""
+    ids = tokenizer.encode(chat)
+
+    text_replace_idx = ids.index(text_replace)
+    ids = ids[:text_replace_idx] + [text_prompt_start] + input_ids + [text_prompt_end] + ids[text_replace_idx + 1 :]
+
+    speech_replace_idx = ids.index(speech_replace)
+    codes_str = "".join([f"<|speech_{i}|>" for i in ref_codes])
+    codes = tokenizer.encode(codes_str, add_special_tokens=False)
+    return ids[:speech_replace_idx] + [speech_gen_start] + list(codes)
+
+
+def time_per_call(fn, texts: list[str], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - start) / (rounds * len(texts))
+
+
+def main(backbone: str, voice_codes: str, ref_text: str, rounds: int):
+    tokenizer = AutoTokenizer.from_pretrained(backbone)
+    ref_codes = torch.load(voice_codes, map_location="cpu")
+    print(f"Reference: {ref_codes.numel()} codes, {len(SENTENCES)} sentences x {rounds} rounds\n")
+
+    start = time.perf_counter()
+    builder = vt._PromptBuilder.from_transformers(tokenizer, vt._build_speech_token_table(tokenizer))
+    print(f"Builder setup: {(time.perf_counter() - start) * 1e3:.1f} ms (once per model)")
+
+    for text in SENTENCES:
+        if builder.build(ref_codes, ref_text, text) != original_chat_template(tokenizer, ref_codes, ref_text, text):
+            raise AssertionError(f"Prompt IDs differ from the original template for: {text}")
+    print("✅ Prompt IDs match the original template\n")
+
+    # Phonemization dominates end to end; replacing it with identity isolates the template cost
+    for label, phonemize in (("with phonemization", phonemize_with_dict), ("pre-phonemized", lambda text: text)):
+        vt.phonemize_with_dict = phonemize
+        old = time_per_call(lambda text: original_chat_template(tokenizer, ref_codes, ref_text, text), SENTENCES, rounds)
+        new = time_per_call(lambda text: builder.build(ref_codes, ref_text, text), SENTENCES, rounds)
+        print(f"{label}:")
+        print(f"  original template: {old * 1e3:8.3f} ms/prompt")
+        print(f"  prompt builder:    {new * 1e3:8.3f} ms/prompt  ({old / new:.1f}x)")
+    vt.phonemize_with_dict = phonemize_with_dict
+    print(f"\nVoice cache: {builder.stats()}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark transformers prompt construction")
+    parser.add_argument("--backbone", default="pnnbao-ump/VieNeu-TTS", help="Backbone repository (tokenizer only).")
+    parser.add_argument("--voice-codes", default="./sample/Vĩnh (nam miền Nam).pt", help="Reference codes.")
+    parser.add_argument("--voice-text", default="./sample/Vĩnh (nam miền Nam).txt", help="Reference transcript file.")
+    parser.add_argument("--rounds", type=int, default=50, help="Rounds over the sentence set.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    with open(args.voice_text, "r", encoding="utf-8") as f:
+        ref_text = f.read().strip()
+    main(args.backbone, args.voice_codes, ref_text, args.rounds)
@@ -0,0 +1,163 @@
+"""
+Streaming codec decode: correctness and cost per emitted second of audio.
+
+Streams the codes of a sample voice through StreamingCodecDecoder with
+several left-context lengths and reports, for each one:
+  - decoded frames per emitted frame and codec FLOPs (torch codecs only)
+  - decode time per emitted second of audio
+  - max error / SNR against the original 50-frame windowed output
+and the smallest context whose SNR reaches --min-snr. Fails if the shipped
+STREAMING_DECODE_CONTEXT_FRAMES does not reach --min-snr.
+
+The 50-frame run is checked against a straight re-implementation of the
+original windowed decode (full overlap-add recompute per chunk).
+
+Run from the repository root:
+    python -m benchmarks.bench_streaming_decoder --codec neuphonic/neucodec
+"""
+import argparse
+from types import SimpleNamespace
+import numpy as np
+import torch
+from vieneu_tts.vieneu_tts import (
+    STREAMING_DECODE_CONTEXT_FRAMES,
+    VieNeuTTS,
+    StreamingCodecDecoder,
+    StreamingOverlapAdd,
+    _linear_overlap_add,
+)
+
+
+HOP_LENGTH = 480
+SAMPLE_RATE = 24_000
+OVERLAP_FRAMES = 1
+LOOKFORWARD = 5
+REFERENCE_LOOKBACK = 50
+
+
+def load_codec(codec_repo: str, device: str):
+    """Load only the codec, reusing VieNeuTTS codec loading and decoding."""
+    shim = SimpleNamespace(_is_onnx_codec=False)
+    VieNeuTTS._load_codec(shim, codec_repo, device)
+    shim.decode_codes = lambda ids: VieNeuTTS._decode_codes(shim, ids)
+    return shim
+
+
+def reference_stream(decode_codes, ref_codes, codes, frames_per_chunk) -> np.ndarray:
+    """Original windowed streaming decode, recomputing overlap-add over all chunks."""
+    stride = frames_per_chunk * HOP_LENGTH
+    token_cache = list(ref_codes)
+    audio_cache, out = [], []
+    n_decoded_samples, n_decoded_tokens = 0, len(ref_codes)
+
+    for code in codes:
+        token_cache.append(code)
+        if len(token_cache) - n_decoded_tokens >= frames_per_chunk + LOOKFORWARD:
+            start = max(n_decoded_tokens - REFERENCE_LOOKBACK - OVERLAP_FRAMES, 0)
+            end = n_decoded_tokens + frames_per_chunk + LOOKFORWARD + OVERLAP_FRAMES
+            sample_start = (n_decoded_tokens - start) * HOP_LENGTH
+            sample_end = sample_start + (frames_per_chunk + 2 * OVERLAP_FRAMES) * HOP_LENGTH
+            audio_cache.append(decode_codes(token_cache[start:end])[sample_start:sample_end])
+            processed = _linear_overlap_add(audio_cache, stride=stride)
+            new_samples_end = len(audio_cache) * stride
+            out.append(processed[n_decoded_samples:new_samples_end])
+            n_decoded_samples = new_samples_end
+            n_decoded_tokens += frames_per_chunk
+
+    remaining = len(token_cache) - n_decoded_tokens
+    if remaining > 0:
+        start = max(len(token_cache) - (REFERENCE_LOOKBACK + OVERLAP_FRAMES + remaining), 0)
+        sample_start = (len(token_cache) - start - remaining - OVERLAP_FRAMES) * HOP_LENGTH
+        audio_cache.append(decode_codes(token_cache[start:])[sample_start:])
+        out.append(_linear_overlap_add(audio_cache, stride=stride)[n_decoded_samples:])
+    return np.concatenate(out)
+
+
+def streaming_decode(decode_codes, ref_codes, codes, frames_per_chunk, context_frames):
+    decoder = StreamingCodecDecoder(
+        decode_codes,
+        hop_length=HOP_LENGTH,
+        context_frames=context_frames,
+        lookforward_frames=LOOKFORWARD,
+        overlap_frames=OVERLAP_FRAMES,
+        ref_codes=ref_codes,
+    )
+    overlap_add = StreamingOverlapAdd(stride=frames_per_chunk * HOP_LENGTH)
+    out = []
+    for code in codes:
+        decoder.append(code)
+        if decoder.n_pending >= frames_per_chunk + LOOKFORWARD:
+            out.append(overlap_add.push(decoder.decode_chunk(frames_per_chunk)))
+    if decoder.n_pending > 0:
+        out.append(overlap_add.flush(decoder.decode_final()))
+    return np.concatenate(out), decoder.stats()
+
+
+def count_flops(fn) -> int | None:
+    try:
+        from torch.utils.flop_counter import FlopCounterMode
+    except ImportError:
+        return None
+    with FlopCounterMode(display=False) as counter:
+        fn()
+    return counter.get_total_flops()
+
+
+def main(codec_repo: str, device: str, voice_codes: str, frames_per_chunk: int, contexts: list[int], repeat: int, min_snr: float):
+    codec = load_codec(codec_repo, device)
+    voice = torch.load(voice_codes, map_location="cpu").flatten().tolist()
+    ref_codes, codes = voice[: len(voice) // 2], voice * repeat
+    emitted_seconds = len(codes) * HOP_LENGTH / SAMPLE_RATE
+    print(f"Streaming {len(codes)} codes ({emitted_seconds:.1f}s of audio), {frames_per_chunk} frames per chunk\n")
+
+    expected = reference_stream(codec.decode_codes, ref_codes, codes, frames_per_chunk)
+    actual, _ = streaming_decode(codec.decode_codes, ref_codes, codes, frames_per_chunk, REFERENCE_LOOKBACK)
+    if actual.shape != expected.shape or not np.allclose(actual, expected, atol=1e-5):
+        raise AssertionError("StreamingCodecDecoder differs from the original windowed decode")
+    print(f"✅ {REFERENCE_LOOKBACK}-frame context matches the original windowed decode\n")
+
+    if STREAMING_DECODE_CONTEXT_FRAMES not in contexts:
+        contexts = [STREAMING_DECODE_CONTEXT_FRAMES] + contexts
+    passing = []
+    print(f"{'context':>8} {'decoded/emitted':>16} {'GFLOPs/s audio':>15} {'ms/s audio':>11} {'max err':>9} {'SNR (dB)':>9}")
+    for context in contexts:
+        audio, stats = streaming_decode(codec.decode_codes, ref_codes, codes, frames_per_chunk, context)
+        flops = None
+        if not codec._is_onnx_codec:
+            flops = count_flops(lambda: streaming_decode(codec.decode_codes, ref_codes, codes, frames_per_chunk, context))
+        error = audio - expected
+        snr = 10 * np.log10(np.sum(expected**2) / max(np.sum(error**2), 1e-20))
+        flops_str = f"{flops / 1e9 / emitted_seconds:>15.2f}" if flops else f"{'n/a':>15}"
+        print(
+            f"{context:>8} {stats['decoded_per_emitted']:>16.2f} {flops_str} "
+            f"{stats['decode_time'] * 1e3 / emitted_seconds:>11.1f} "
+            f"{np.abs(error).max():>9.4f} {snr:>9.1f}"
+        )
+        if snr >= min_snr:
+            passing.append(context)
+
+    if passing:
+        print(f"\nSmallest context with SNR >= {min_snr:.0f} dB: {min(passing)} frames")
+    else:
+        print(f"\nNo context reaches {min_snr:.0f} dB")
+    if STREAMING_DECODE_CONTEXT_FRAMES not in passing:
+        raise AssertionError(f"STREAMING_DECODE_CONTEXT_FRAMES = {STREAMING_DECODE_CONTEXT_FRAMES} is below {min_snr:.0f} dB SNR")
+    print(f"✅ STREAMING_DECODE_CONTEXT_FRAMES = {STREAMING_DECODE_CONTEXT_FRAMES} reaches {min_snr:.0f} dB")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the streaming codec decoder")
+    parser.add_argument("--codec", default="neuphonic/neucodec", help="Codec repository.")
+    parser.add_argument("--device", default="cpu", help="Codec device.")
+    parser.add_argument("--voice-codes", default="./sample/Vĩnh (nam miền Nam).pt", help="Pre-encoded codes used as the stream.")
+    parser.add_argument("--frames-per-chunk", type=int, default=25, help="Frames emitted per chunk.")
+    parser.add_argument("--contexts", type=int, nargs="+", default=[50, 32, 24, 16, 8, 4], help="Left context lengths to compare.")
+    parser.add_argument("--repeat", type=int, default=4, help="Repeat the voice codes to lengthen the stream.")
+    parser.add_argument("--min-snr", type=float, default=30.0, help="SNR (dB) a context must reach vs. 50 frames.")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    with torch.no_grad():
+        main(args.codec, args.device, args.voice_codes, args.frames_per_chunk, args.contexts, args.repeat, args.min_snr)
@@ -2,7 +2,7 @@
 
 import base64
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -68,22 +68,7 @@ class ColabTTSClient:
             Audio data as bytes, or None if request fails
         """
         try:
-            # Read and encode voice sample as base64
-            import base64
-            import os
-            
-            voice_audio_base64 = ""
-            if voice_sample_path and os.path.exists(voice_sample_path):
-                with open(voice_sample_path, 'rb') as f:
-                    voice_audio_base64 = base64.b64encode(f.read()).decode('utf-8')
-            
-            payload = {
-                "text": text,
-                "voice_audio_base64": voice_audio_base64,  # Send audio data, not path
-                "voice_transcript": voice_transcript,
-                "speed": speed,
-                "watermark": watermark
-            }
+            payload = self._build_payload(text, voice_sample_path, voice_transcript, speed, watermark)
             
             response = self.session.post(
                 f"{self.endpoint_url}/tts/synthesize",
@@ -105,6 +90,84 @@ class ColabTTSClient:
         except Exception as e:
             raise RuntimeError(f"Failed to decode Colab response: {str(e)}")
     
+    def _build_payload(
+        self,
+        text: str,
+        voice_sample_path: str,
+        voice_transcript: str,
+        speed: float,
+        watermark: bool
+    ) -> Dict[str, Any]:
+        """Build the synthesize request body, reading the voice sample as base64."""
+        import os
+        
+        voice_audio_base64 = ""
+        if voice_sample_path and os.path.exists(voice_sample_path):
+            with open(voice_sample_path, 'rb') as f:
+                voice_audio_base64 = base64.b64encode(f.read()).decode('utf-8')
+        
+        return {
+            "text": text,
+            "voice_audio_base64": voice_audio_base64,  # Send audio data, not path
+            "voice_transcript": voice_transcript,
+            "speed": speed,
+            "watermark": watermark
+        }
+    
+    def _async_client(self):
+        """New httpx.AsyncClient with this client's headers, timeout and retries (one per call)."""
+        import httpx
+        
+        return httpx.AsyncClient(
+            headers=dict(self.session.headers),
+            timeout=self.timeout,
+            transport=httpx.AsyncHTTPTransport(retries=2),
+        )
+    
+    async def asynthesize(
+        self,
+        text: str,
+        voice_sample_path: str,
+        voice_transcript: str,
+        speed: float = 1.0,
+        watermark: bool = True
+    ) -> Optional[bytes]:
+        """
+        Async version of `synthesize` using a non-blocking HTTP client.
+        
+        Args:
+            text: Text to synthesize
+            voice_sample_path: Path to voice sample audio (will be read and sent as base64)
+            voice_transcript: Transcript of voice sample
+            speed: Speech speed multiplier
+            watermark: Whether to add audio watermark
+            
+        Returns:
+            Audio data as bytes
+        """
+        import httpx
+        
+        try:
+            payload = self._build_payload(text, voice_sample_path, voice_transcript, speed, watermark)
+            
+            # Scoped to the call: an httpx client is bound to the event loop it first ran on
+            async with self._async_client() as client:
+                response = await client.post(
+                    f"{self.endpoint_url}/tts/synthesize",
+                    json=payload,
+                )
+            response.raise_for_status()
+            
+            data = response.json()
+            return base64.b64decode(data.get("audio_base64", ""))
+            
+        except httpx.TimeoutException:
+            raise TimeoutError(f"Colab request timed out after {self.timeout}s")
+        except httpx.HTTPError as e:
+            raise ConnectionError(f"Colab request failed: {str(e)}")
+        except Exception as e:
+            raise RuntimeError(f"Failed to decode Colab response: {str(e)}")
+    
     def health_check(self) -> Dict[str, Any]:
         """
         Check Colab backend health status.
@@ -253,6 +316,57 @@ class ColabTTSClient:
         # Process sequentially (Colab backend doesn't support true batching)
         return [self.infer(chunk, ref_codes, ref_text) for chunk in text_chunks]
     
+    async def ainfer(self, text: str, ref_codes, ref_text: str):
+        """
+        Async version of `infer`.
+        
+        Args:
+            text: Text to synthesize
+            ref_codes: Reference codes (not used by Colab backend)
+            ref_text: Reference transcript
+            
+        Returns:
+            Audio array (numpy)
+        """
+        import soundfile as sf
+        import io
+        
+        audio_bytes = await self.asynthesize(
+            text=text,
+            voice_sample_path=self._cached_voice_path or "",
+            voice_transcript=ref_text,
+            speed=1.0,
+            watermark=True
+        )
+        
+        audio_array, sample_rate = sf.read(io.BytesIO(audio_bytes))
+        
+        return audio_array
+    
+    async def ainfer_batch(self, text_chunks: list, ref_codes, ref_text: str, max_batch_size: int = None):
+        """
+        Async batch inference (sequential, like `infer_batch`).
+        
+        Args:
+            text_chunks: List of text chunks to synthesize
+            ref_codes: Reference codes (not used by Colab backend)
+            ref_text: Reference transcript
+            max_batch_size: Unused, accepted for interface compatibility
+            
+        Returns:
+            List of audio arrays
+        """
+        return [await self.ainfer(chunk, ref_codes, ref_text) for chunk in text_chunks]
+    
+    async def ainfer_stream(self, text: str, ref_codes, ref_text: str, metrics=None) -> AsyncIterator:
+        """
+        Async streaming interface; the Colab backend returns the whole chunk at once.
+        
+        Yields:
+            Audio array (numpy)
+        """
+        yield await self.ainfer(text, ref_codes, ref_text)
+    
     def __del__(self):
         """Cleanup session on deletion."""
         if hasattr(self, 'session'):
@@ -8,6 +8,7 @@ import numpy as np
 import soundfile as sf
 import torch
 from vieneu_tts import VieNeuTTS
+from utils.phonemize_text import phonemize_reference
 
 
 def split_text_into_chunks(text: str, max_chars: int = 256) -> List[str]:
@@ -94,6 +95,7 @@ def infer_long_text(
         os.makedirs(chunk_dir, exist_ok=True)
 
     ref_text_raw = Path(ref_text_path).read_text(encoding="utf-8")
+    phonemize_reference(ref_text_raw, ref_text_path)
 
     tts = VieNeuTTS(
         backbone_repo=backbone_repo,
@@ -4,12 +4,14 @@ import tempfile
 import torch
 import os
 import time
+import threading
 import numpy as np
 from typing import Generator, Optional, Tuple
 import yaml
 from model_manager import ModelManager, ModelStatus
 from auth import UserManager, SessionManager, UserRole
 from utils.core_utils import split_text_into_chunks
+from utils.phonemize_text import phonemize_reference
 from functools import lru_cache
 
 
@@ -21,18 +23,27 @@ with open(CONFIG_PATH, "r", encoding="utf-8") as f:
 VOICE_SAMPLES = _config.get("voice_samples", {})
 _text_settings = _config.get("text_settings", {})
 MAX_CHARS_PER_CHUNK = _text_settings.get("max_chars_per_chunk", 256)
+CHUNKING = _text_settings.get("chunking", "tokens")
+_batching = _config.get("batching", {})
+MAX_CONCURRENT_REQUESTS = _batching.get("max_batch_size", 8)
 
 # Initialize managers
 model_manager = ModelManager.get_instance()
+model_manager.configure_batching(_batching.get("enabled", True), _batching.get("window_ms", 10))
 user_manager = UserManager()
 session_manager = SessionManager()
 
+# Requests to backends that cannot take concurrent calls wait here
+_sequential_lock = threading.Lock()
+
 
 @lru_cache(maxsize=32)
 def get_ref_text_cached(text_path: str) -> str:
-    """Cache reference text loading"""
+    """Cache reference text loading (and its phonemes, persisted next to the file)"""
     with open(text_path, "r", encoding="utf-8") as f:
-        return f.read()
+        ref_text = f.read()
+    phonemize_reference(ref_text, text_path)
+    return ref_text
 
 
 def recover_user_session():
@@ -159,51 +170,35 @@ def get_available_voices():
     return supported_voices
 
 
-def synthesize_tts(token, text, voice_choice, custom_audio, custom_text, mode_tab, use_batch):
-    """User TTS synthesis."""
-    if not validate_user_session(token):
-        yield None, "❌ Unauthorized. Please login."
-        return
-    
-    if not check_model_ready():
-        yield None, "⚠️ Model is not loaded. Please contact administrator."
-        return
-    
-    if not text or text.strip() == "":
-        yield None, "⚠️ Please enter text to synthesize"
-        return
-    
-    raw_text = text.strip()
-    tts = model_manager.get_model()
+def _prepare_reference(tts, voice_choice, custom_audio, custom_text, mode_tab):
+    """
+    Resolve reference codes and transcript for the selected voice.
     
-    if tts is None:
-        yield None, "❌ Model not available"
-        return
+    Returns:
+        (ref_codes, ref_text_raw)
     
+    Raises:
+        ValueError: With a user-facing status message
+    """
     # Setup Reference
     if mode_tab == "custom_mode":
         if custom_audio is None or not custom_text:
-            yield None, "⚠️ Please provide reference audio and text"
-            return
+            raise ValueError("⚠️ Please provide reference audio and text")
         ref_audio_path = custom_audio
         ref_text_raw = custom_text
         ref_codes_path = None
     else:
         if voice_choice not in VOICE_SAMPLES:
-            yield None, "⚠️ Please select a voice"
-            return
+            raise ValueError("⚠️ Please select a voice")
         ref_audio_path = VOICE_SAMPLES[voice_choice]["audio"]
         text_path = VOICE_SAMPLES[voice_choice]["text"]
         ref_codes_path = VOICE_SAMPLES[voice_choice]["codes"]
         
         if not os.path.exists(ref_audio_path):
-            yield None, "❌ Reference audio not found"
-            return
+            raise ValueError("❌ Reference audio not found")
         
         ref_text_raw = get_ref_text_cached(text_path)
     
-    yield None, "📄 Processing reference..."
-    
     # Encode or load reference
     try:
         status_info = model_manager.get_status()
@@ -223,15 +218,70 @@ def synthesize_tts(token, text, voice_choice, custom_audio, custom_text, mode_ta
         if isinstance(ref_codes, torch.Tensor):
             ref_codes = ref_codes.cpu().numpy()
     except Exception as e:
-        yield None, f"❌ Error processing reference: {e}"
+        raise ValueError(f"❌ Error processing reference: {e}") from e
+    
+    return ref_codes, ref_text_raw
+
+
+def _split_chunks(tts, raw_text, ref_codes, ref_text_raw):
+    """Split text into chunks that fit the context with this voice (or by characters)"""
+    return list(_iter_chunks(tts, raw_text, ref_codes, ref_text_raw))
+
+
+def _iter_chunks(tts, raw_text, ref_codes, ref_text_raw):
+    """Chunks of `_split_chunks` one at a time, so streaming starts before the whole text is processed"""
+    if CHUNKING == "tokens" and hasattr(tts, "iter_split_text"):
+        return tts.iter_split_text(raw_text, ref_codes, ref_text_raw)
+    return iter(split_text_into_chunks(raw_text, max_chars=MAX_CHARS_PER_CHUNK))
+
+
+def _check_request(token, text):
+    """Return an error status for an invalid synthesis request, or None."""
+    if not validate_user_session(token):
+        return "❌ Unauthorized. Please login."
+    
+    if not check_model_ready():
+        return "⚠️ Model is not loaded. Please contact administrator."
+    
+    if not text or text.strip() == "":
+        return "⚠️ Please enter text to synthesize"
+    
+    return None
+
+
+def _to_pcm16(wav: np.ndarray) -> np.ndarray:
+    """Convert float audio in [-1, 1] to int16 PCM for streaming playback."""
+    return (np.clip(wav, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+def synthesize_tts(token, text, voice_choice, custom_audio, custom_text, mode_tab, use_batch):
+    """User TTS synthesis."""
+    error = _check_request(token, text)
+    if error:
+        yield None, error
+        return
+    
+    raw_text = text.strip()
+    tts = model_manager.get_model()
+    
+    if tts is None:
+        yield None, "❌ Model not available"
+        return
+    
+    yield None, "📄 Processing reference..."
+    
+    try:
+        ref_codes, ref_text_raw = _prepare_reference(tts, voice_choice, custom_audio, custom_text, mode_tab)
+    except ValueError as e:
+        yield None, str(e)
         return
     
     # Split text into chunks
-    text_chunks = split_text_into_chunks(raw_text, max_chars=MAX_CHARS_PER_CHUNK)
+    text_chunks = _split_chunks(tts, raw_text, ref_codes, ref_text_raw)
     total_chunks = len(text_chunks)
     
     backend_name = "LMDeploy" if model_manager.using_lmdeploy else "Standard"
-    batch_info = " (Batch)" if use_batch and model_manager.using_lmdeploy and total_chunks > 1 else ""
+    batch_info = " (Batch)" if use_batch and model_manager.supports_batch_inference() and total_chunks > 1 else ""
     
     yield None, f"🚀 Synthesizing {backend_name}{batch_info} ({total_chunks} chunks)..."
     
@@ -242,8 +292,27 @@ def synthesize_tts(token, text, voice_choice, custom_audio, custom_text, mode_ta
     start_time = time.time()
     
     try:
+        scheduler = model_manager.get_batch_scheduler()
+        if scheduler is not None:
+            # Chunks share forward passes with the chunks of other in-flight requests
+            futures = scheduler.submit(text_chunks, ref_codes, ref_text_raw) if use_batch else []
+            try:
+                for i, chunk in enumerate(text_chunks):
+                    yield None, f"⏳ Processing chunk {i+1}/{total_chunks}..."
+                    
+                    chunk_wav = futures[i].result() if futures else scheduler.infer(chunk, ref_codes, ref_text_raw)
+                    
+                    if chunk_wav is not None and len(chunk_wav) > 0:
+                        all_audio_segments.append(chunk_wav)
+                        if i < total_chunks - 1:
+                            all_audio_segments.append(silence_pad)
+            finally:
+                # Drop the queued chunks of an abandoned request
+                for future in futures:
+                    future.cancel()
+        
         # Use batch processing if available and enabled
-        if use_batch and model_manager.using_lmdeploy and hasattr(tts, 'infer_batch') and total_chunks > 1:
+        elif use_batch and model_manager.supports_batch_inference() and hasattr(tts, 'infer_batch') and total_chunks > 1:
             chunk_wavs = tts.infer_batch(text_chunks, ref_codes, ref_text_raw)
             
             for i, chunk_wav in enumerate(chunk_wavs):
@@ -283,6 +352,91 @@ def synthesize_tts(token, text, voice_choice, custom_audio, custom_text, mode_ta
         yield None, f"❌ Error: {str(e)}"
 
 
+def synthesize_tts_stream(token, text, voice_choice, custom_audio, custom_text, mode_tab):
+    """
+    Streaming TTS synthesis for `gr.Audio(streaming=True)`.
+    
+    Yields (audio, status) where audio is a (sample_rate, int16 PCM) chunk or
+    None for status-only updates. Text chunks are generated back to back and
+    crossfaded into one continuous stream; backends with `infer_stream` emit
+    audio while tokens are generated, others (e.g. Colab) emit each finished
+    text chunk.
+    """
+    from vieneu_tts.long_text import stream_long_text
+    
+    error = _check_request(token, text)
+    if error:
+        yield None, error
+        return
+    
+    raw_text = text.strip()
+    tts = model_manager.get_model()
+    
+    if tts is None:
+        yield None, "❌ Model not available"
+        return
+    
+    yield None, "📄 Processing reference..."
+    
+    try:
+        ref_codes, ref_text_raw = _prepare_reference(tts, voice_choice, custom_audio, custom_text, mode_tab)
+    except ValueError as e:
+        yield None, str(e)
+        return
+    
+    text_chunks = _iter_chunks(tts, raw_text, ref_codes, ref_text_raw)
+    
+    yield None, "🚀 Streaming..."
+    
+    sr = 24000
+    total_samples = 0
+    first_audio_time = None
+    
+    start_time = time.time()
+    
+    try:
+        for piece in stream_long_text(tts, text_chunks, ref_codes, ref_text_raw, sample_rate=sr):
+            if first_audio_time is None:
+                first_audio_time = time.time() - start_time
+            total_samples += len(piece)
+            yield (sr, _to_pcm16(piece)), f"🔊 Streaming... ({total_samples/sr:.1f}s of audio)"
+        
+        if first_audio_time is None:
+            yield None, "❌ Failed to generate audio"
+            return
+        
+        process_time = time.time() - start_time
+        speed_info = f", Speed: {total_samples/sr/process_time:.2f}x realtime" if process_time > 0 else ""
+        
+        yield None, (
+            f"✅ Complete! (First audio: {first_audio_time:.2f}s, "
+            f"Time: {process_time:.2f}s{speed_info})"
+        )
+        
+    except Exception as e:
+        yield None, f"❌ Error: {str(e)}"
+
+
+def synthesize(token, text, voice_choice, custom_audio, custom_text, mode_tab, use_batch, use_streaming):
+    """Route to file or streaming synthesis; yields (file, stream chunk, status)."""
+    # Up to MAX_CONCURRENT_REQUESTS run at once so the LMDeploy batch scheduler
+    # can merge their chunks; every other backend takes one request at a time
+    if model_manager.supports_concurrent_requests():
+        yield from _synthesize(token, text, voice_choice, custom_audio, custom_text, mode_tab, use_batch, use_streaming)
+    else:
+        with _sequential_lock:
+            yield from _synthesize(token, text, voice_choice, custom_audio, custom_text, mode_tab, use_batch, use_streaming)
+
+
+def _synthesize(token, text, voice_choice, custom_audio, custom_text, mode_tab, use_batch, use_streaming):
+    if use_streaming:
+        for audio, status in synthesize_tts_stream(token, text, voice_choice, custom_audio, custom_text, mode_tab):
+            yield gr.skip(), audio if audio is not None else gr.skip(), status
+    else:
+        for output_path, status in synthesize_tts(token, text, voice_choice, custom_audio, custom_text, mode_tab, use_batch):
+            yield output_path, gr.skip(), status
+
+
 def create_user_interface():
     """Create user Gradio interface."""
     
@@ -341,6 +495,11 @@ def create_user_interface():
                         label="⚡ Batch Processing (faster when available)",
                     )
                     
+                    use_streaming = gr.Checkbox(
+                        value=False,
+                        label="🔊 Streaming Playback (hear audio while it is generated)",
+                    )
+                    
                     current_mode = gr.Textbox(visible=False, value="preset_mode")
                     
                     synthesize_btn = gr.Button("🎵 Synthesize", variant="primary", size="lg")
@@ -352,6 +511,12 @@ def create_user_interface():
                         type="filepath",
                         autoplay=True
                     )
+                    stream_output = gr.Audio(
+                        label="Generated Audio (Streaming)",
+                        streaming=True,
+                        autoplay=True,
+                        visible=False
+                    )
                     status_output = gr.Textbox(label="Status", interactive=False)
         
         # JavaScript to store token in localStorage
@@ -407,10 +572,17 @@ def create_user_interface():
             outputs=[model_status, voice_select]
         )
         
+        use_streaming.change(
+            fn=lambda streaming: (gr.update(visible=not streaming), gr.update(visible=streaming)),
+            inputs=[use_streaming],
+            outputs=[audio_output, stream_output]
+        )
+        
         synthesize_btn.click(
-            fn=synthesize_tts,
-            inputs=[session_token, text_input, voice_select, custom_audio, custom_text, current_mode, use_batch],
-            outputs=[audio_output, status_output]
+            fn=synthesize,
+            inputs=[session_token, text_input, voice_select, custom_audio, custom_text, current_mode, use_batch, use_streaming],
+            outputs=[audio_output, stream_output, status_output],
+            concurrency_limit=MAX_CONCURRENT_REQUESTS,
         )
     
     return user_interface
@@ -1,4 +1,5 @@
 from vieneu_tts import VieNeuTTS
+from utils.phonemize_text import phonemize_reference
 import soundfile as sf
 import torch
 import os
@@ -48,6 +49,7 @@ def main(backbone="pnnbao-ump/VieNeu-TTS-q4-gguf", codec="neuphonic/neucodec-onn
     # ref_text_path = "./sample/Đoan (nữ miền Nam).txt"
 
     ref_text_raw = open(ref_text_path, "r", encoding="utf-8").read()
+    phonemize_reference(ref_text_raw, ref_text_path)
     
     if not ref_audio_path or not ref_text_raw:
         print("No reference audio or text provided.")
@@ -1,6 +1,10 @@
 import threading
+import itertools
+import queue
+import time
 import torch
 import gc
+from concurrent.futures import Future
 from typing import Optional, Dict, Any, List
 from enum import Enum
 
@@ -27,6 +31,126 @@ class BackendMode(str, Enum):
     REMOTE = "remote"
 
 
+class BatchScheduler:
+    """
+    Batches chunks of concurrent synthesis requests into shared forward passes.
+    
+    Submitted chunks are queued with their own voice. A worker thread collects
+    them for up to `window` seconds after the first one arrives (or until
+    `max_batch_size` are waiting), runs them as one `infer_batch` call on the
+    current model and resolves each chunk's future with its waveform. If the
+    batch call fails, its chunks are rerun one by one with `infer`, so an
+    error only reaches the request whose chunk caused it.
+    
+    Batches only span requests when the server runs several at once (see
+    `batching.max_batch_size` in config.yaml); `shared_batches` counts them.
+    """
+    
+    def __init__(self, get_model, max_batch_size: int = 8, window: float = 0.01):
+        """
+        Args:
+            get_model: Returns the engine to run a batch on (with per-text `infer_batch` voices), or None
+            max_batch_size: Maximum chunks per `infer_batch` call
+            window: Seconds to wait for more chunks after the first one
+        """
+        self._get_model = get_model
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self._queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self._requests = itertools.count()
+        self.batches = 0
+        self.items = 0
+        self.shared_batches = 0
+        self.retried_batches = 0
+    
+    def submit(self, texts: List[str], ref_codes, ref_text: str) -> List[Future]:
+        """Queue chunks of one request, returns one future per chunk."""
+        self._ensure_worker()
+        request = next(self._requests)
+        futures = []
+        for text in texts:
+            future = Future()
+            self._queue.put((text, ref_codes, ref_text, future, request))
+            futures.append(future)
+        return futures
+    
+    def infer(self, text: str, ref_codes, ref_text: str):
+        """Synthesize one chunk, batched with whatever else is in flight."""
+        return self.submit([text], ref_codes, ref_text)[0].result()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'mean_batch_size': self.items / self.batches if self.batches else 0.0,
+            'shared_batches': self.shared_batches,
+            'retried_batches': self.retried_batches,
+            'queued': self._queue.qsize(),
+        }
+    
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="BatchScheduler", daemon=True)
+                    self._worker.start()
+    
+    def _collect(self) -> list:
+        """Block for the first chunk, then gather more until the window closes or the batch is full."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+    
+    def _run(self):
+        while True:
+            # Drop chunks of requests that were cancelled while queued
+            batch = [item for item in self._collect() if item[3].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            
+            tts = self._get_model()
+            if tts is None:
+                for _, _, _, future, _ in batch:
+                    future.set_exception(RuntimeError("Model not available"))
+                continue
+            
+            try:
+                wavs = tts.infer_batch(
+                    [text for text, _, _, _, _ in batch],
+                    [ref_codes for _, ref_codes, _, _, _ in batch],
+                    [ref_text for _, _, ref_text, _, _ in batch],
+                    max_batch_size=len(batch),
+                )
+            except Exception:
+                # One bad chunk fails the whole call: rerun the chunks alone
+                # so only the faulty one reports the error
+                self.retried_batches += 1
+                for text, ref_codes, ref_text, future, _ in batch:
+                    try:
+                        future.set_result(tts.infer(text, ref_codes, ref_text))
+                    except Exception as e:
+                        future.set_exception(e)
+                continue
+            
+            self.batches += 1
+            self.items += len(batch)
+            n_requests = len({request for *_, request in batch})
+            if n_requests > 1:
+                if not self.shared_batches:
+                    print(f"BatchScheduler: first shared batch, {len(batch)} chunks from {n_requests} requests")
+                self.shared_batches += 1
+            for (_, _, _, future, _), wav in zip(batch, wavs):
+                future.set_result(wav)
+
+
 class ModelManager:
     """Singleton manager for TTS model lifecycle."""
     
@@ -44,6 +168,12 @@ class ModelManager:
         self.using_lmdeploy = False
         self._model_lock = threading.Lock()
         
+        # Cross-request batching (LMDeploy backend)
+        self.batching_enabled = True
+        self.batch_window = 0.01
+        self._batch_scheduler = None
+        self._scheduler_lock = threading.Lock()
+        
         # Colab backend support
         self._backend_mode = BackendMode.LOCAL
         self._colab_client = None
@@ -73,6 +203,9 @@ class ModelManager:
             "supported_voices": self.get_supported_voices(),
         }
         
+        if self._batch_scheduler is not None:
+            status_info["batching"] = self._batch_scheduler.stats()
+        
         if torch.cuda.is_available() and self.status == ModelStatus.LOADED:
             try:
                 status_info["gpu_memory_allocated"] = torch.cuda.memory_allocated() / 1024**3
@@ -289,6 +422,48 @@ class ModelManager:
         else:
             return self.tts if self.status == ModelStatus.LOADED else None
     
+    def supports_batch_inference(self) -> bool:
+        """Whether `infer_batch` generates chunks together (LMDeploy, or a local transformers model)."""
+        if self.using_lmdeploy:
+            return True
+        if self._backend_mode != BackendMode.LOCAL or self.status != ModelStatus.LOADED:
+            return False
+        return "gguf" not in self.config.get("backbone_repo", "").lower()
+    
+    def supports_concurrent_requests(self) -> bool:
+        """Whether several requests may call the model at once (local LMDeploy engine only)."""
+        return self._get_batch_model() is not None
+    
+    def configure_batching(self, enabled: bool = True, window_ms: float = 10):
+        """Enable or disable cross-request batching and set its collection window."""
+        self.batching_enabled = enabled
+        self.batch_window = window_ms / 1000
+    
+    def get_batch_scheduler(self) -> Optional[BatchScheduler]:
+        """
+        Get the cross-request batch scheduler for the current model.
+        
+        Returns:
+            BatchScheduler, None if batching is disabled or the model cannot batch requests
+        """
+        if not self.batching_enabled or self._get_batch_model() is None:
+            return None
+        
+        if self._batch_scheduler is None:
+            with self._scheduler_lock:
+                if self._batch_scheduler is None:
+                    self._batch_scheduler = BatchScheduler(self._get_batch_model)
+        
+        self._batch_scheduler.max_batch_size = self.config.get("max_batch_size", 8)
+        self._batch_scheduler.window = self.batch_window
+        return self._batch_scheduler
+    
+    def _get_batch_model(self):
+        """Local model whose `infer_batch` takes a voice per text (LMDeploy), or None."""
+        if self._backend_mode != BackendMode.LOCAL or not self.using_lmdeploy:
+            return None
+        return self.tts if self.status == ModelStatus.LOADED else None
+    
     def get_supported_voices(self, all_voices: Optional[List[str]] = None) -> List[str]:
         """
         Get list of supported voice names based on current model configuration.
@@ -1,5 +1,5 @@
 import re
-from typing import List
+from typing import Callable, Iterator, List, Optional
 
 def split_text_into_chunks(text: str, max_chars: int = 256) -> List[str]:
     """
@@ -45,3 +45,57 @@ def split_text_into_chunks(text: str, max_chars: int = 256) -> List[str]:
 
     flush_buffer()
     return [chunk for chunk in chunks if chunk]
+
+
+def iter_text_by_budget(
+    text: str, cost: Callable[[str], float], budget: float, word_cost: Optional[Callable[[str], float]] = None
+) -> Iterator[str]:
+    """
+    Split raw text into chunks whose estimated cost stays within budget,
+    yielding each chunk as soon as it is complete, so only the sentences up to
+    it have been costed.
+    Whole sentences are packed greedily; a sentence over budget on its own is
+    split by words, costed with `word_cost` (default `cost`). Costs are
+    assumed additive, so `cost` runs once per sentence.
+    """
+    word_cost = word_cost or cost
+    buffer: List[str] = []
+    buffer_cost = 0.0
+
+    for sentence in re.split(r"(?<=[\.\!\?\…])\s+", text.strip()):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+
+        sentence_cost = cost(sentence)
+        if sentence_cost <= budget:
+            if buffer_cost + sentence_cost > budget and buffer:
+                yield " ".join(buffer)
+                buffer, buffer_cost = [], 0.0
+            buffer.append(sentence)
+            buffer_cost += sentence_cost
+            continue
+
+        if buffer:
+            yield " ".join(buffer)
+            buffer, buffer_cost = [], 0.0
+        for word in sentence.split():
+            cost_of_word = word_cost(word)
+            if buffer_cost + cost_of_word > budget and buffer:
+                yield " ".join(buffer)
+                buffer, buffer_cost = [], 0.0
+            buffer.append(word)
+            buffer_cost += cost_of_word
+        if buffer:
+            yield " ".join(buffer)
+            buffer, buffer_cost = [], 0.0
+
+    if buffer:
+        yield " ".join(buffer)
+
+
+def split_text_by_budget(
+    text: str, cost: Callable[[str], float], budget: float, word_cost: Optional[Callable[[str], float]] = None
+) -> List[str]:
+    """All chunks of `iter_text_by_budget` as a list."""
+    return list(iter_text_by_budget(text, cost, budget, word_cost))
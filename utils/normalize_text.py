@@ -1,12 +1,109 @@
 import re
+import time
+
+# Patterns of the normalization stages, compiled once at import
+_TEMPERATURE_RULES = [
+    (re.compile(r'-(\d+(?:[.,]\d+)?)\s*°\s*c\b', re.IGNORECASE), r'âm \1 độ xê'),
+    (re.compile(r'-(\d+(?:[.,]\d+)?)\s*°\s*f\b', re.IGNORECASE), r'âm \1 độ ép'),
+    (re.compile(r'(\d+(?:[.,]\d+)?)\s*°\s*c\b', re.IGNORECASE), r'\1 độ xê'),
+    (re.compile(r'(\d+(?:[.,]\d+)?)\s*°\s*f\b', re.IGNORECASE), r'\1 độ ép'),
+    (re.compile(r'°'), ' độ '),
+]
+
+_CURRENCY_MULTIPLIERS = {'k': 'nghìn', 'm': 'triệu', 'b': 'tỷ'}
+_DECIMAL_CURRENCY_RE = re.compile(r'(\d+)[.,](\d+)\s*([kmb])\b', re.IGNORECASE)
+_CURRENCY_RULES = [
+    (re.compile(r'(\d+)\s*k\b', re.IGNORECASE), r'\1 nghìn'),
+    (re.compile(r'(\d+)\s*m\b', re.IGNORECASE), r'\1 triệu'),
+    (re.compile(r'(\d+)\s*b\b', re.IGNORECASE), r'\1 tỷ'),
+    (re.compile(r'(\d+(?:[.,]\d+)?)\s*đ\b'), r'\1 đồng'),
+    (re.compile(r'(\d+(?:[.,]\d+)?)\s*vnd\b', re.IGNORECASE), r'\1 đồng'),
+    (re.compile(r'\$\s*(\d+(?:[.,]\d+)?)'), r'\1 đô la'),
+    (re.compile(r'(\d+(?:[.,]\d+)?)\s*\$'), r'\1 đô la'),
+]
+
+_PERCENTAGE_RE = re.compile(r'(\d+(?:[.,]\d+)?)\s*%')
+
+_COMPOUND_UNIT_WITH_NUMBER_RE = re.compile(r'(\d+(?:[.,]\d+)?)\s*([a-zA-Zμµ²³°]+)/([a-zA-Zμµ²³°0-9]+)\b')
+_COMPOUND_UNIT_RE = re.compile(r'\b([a-zA-Zμµ²³°]+)/([a-zA-Zμµ²³°0-9]+)\b')
+
+_TIME_PATTERNS = [
+    re.compile(r'(\d{1,2}):(\d{2}):(\d{2})'),
+    re.compile(r'(\d{1,2}):(\d{2})'),
+    re.compile(r'(\d{1,2})h(\d{2})'),
+    re.compile(r'(\d{1,2})h\b'),
+]
+
+_PREFIXED_DATE_RE = re.compile(r'\bngày\s+(\d{1,2})[/\-](\d{1,2})[/\-](\d{4})\b')
+_PREFIXED_DATE_SHORT_YEAR_RE = re.compile(r'\bngày\s+(\d{1,2})[/\-](\d{1,2})[/\-](\d{2})\b')
+_ISO_DATE_RE = re.compile(r'\b(\d{4})-(\d{1,2})-(\d{1,2})\b')
+_DATE_RE = re.compile(r'\b(\d{1,2})[/\-](\d{1,2})[/\-](\d{4})\b')
+_DATE_SHORT_YEAR_RE = re.compile(r'\b(\d{1,2})[/\-](\d{1,2})[/\-](\d{2})\b')
+
+_NON_DIGIT_RE = re.compile(r'[^\d]')
+_INTERNATIONAL_PHONE_RE = re.compile(r'(\+84|84)[\s\-\.]?\d[\d\s\-\.]{7,}')
+_PHONE_RE = re.compile(r'\b0\d[\d\s\-\.]{8,}')
+
+_PERCENT_SIGN_RE = re.compile(r'(\d+(?:[,.]\d+)?)%')
+_THOUSANDS_RE = re.compile(r'(\d{1,3})(?:\.(\d{3}))+')
+_DECIMAL_COMMA_RE = re.compile(r'(\d+),(\d+)')
+_DECIMAL_POINT_RE = re.compile(r'(\d+)\.(\d{1,2})\b')
+
+_INTEGER_RE = re.compile(r'\b\d+\b')
+
+_SPECIAL_CHAR_PATTERNS = [
+    re.compile(r'[\[\]\(\)\{\}]'),
+    re.compile(r'\s+[-–—]+\s+'),
+    re.compile(r'\.{2,}'),
+    re.compile(r'\s+\.\s+'),
+    re.compile(r'[^\w\sàáảãạăắằẳẵặâấầẩẫậèéẻẽẹêếềểễệìíỉĩịòóỏõọôốồổỗộơớờởỡợùúủũụưứừửữựỳýỷỹỵđ.,!?;:@%]'),
+]
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class _Stage:
+    """One step of the normalization pipeline, with the time spent in it when profiling."""
+
+    def __init__(self, name, fn):
+        self.name = name
+        self.fn = fn
+        self.reset()
+
+    def timed(self, text):
+        start = time.perf_counter()
+        text = self.fn(text)
+        self.seconds += time.perf_counter() - start
+        self.texts += 1
+        self.chars += len(text)
+        return text
+
+    def timed_many(self, texts):
+        fn = self.fn
+        start = time.perf_counter()
+        texts = [fn(text) for text in texts]
+        self.seconds += time.perf_counter() - start
+        self.texts += len(texts)
+        self.chars += sum(map(len, texts))
+        return texts
+
+    def reset(self):
+        self.seconds = 0.0
+        self.texts = 0
+        self.chars = 0
+
+    def stats(self):
+        return {'seconds': self.seconds, 'texts': self.texts, 'chars': self.chars}
+
 
 class VietnameseTTSNormalizer:
     """
     A text normalizer for Vietnamese Text-to-Speech systems.
     Converts numbers, dates, units, and special characters into readable Vietnamese text.
+
+    With `profile=True` every stage accumulates its time; see `get_stage_stats()`.
     """
     
-    def __init__(self):
+    def __init__(self, profile=False):
         self.units = {
             'km': 'ki lô mét', 'dm': 'đê xi mét', 'cm': 'xen ti mét',
             'mm': 'mi li mét', 'nm': 'na nô mét', 'µm': 'mic rô mét',
@@ -41,229 +138,273 @@ class VietnameseTTSNormalizer:
             'cal': 'ca lo', 'kcal': 'ki lô ca lo',
         }
         
-        self.digits = ['không', 'một', 'hai', 'ba', 'bốn', 
+        self.digits = ['không', 'một', 'hai', 'ba', 'bốn',
                       'năm', 'sáu', 'bảy', 'tám', 'chín']
-    
+
+        self._compile_units()
+        self._compile_number_words()
+
+        self.profile = profile
+        self._stages = [
+            _Stage('temperature', self._normalize_temperature),
+            _Stage('currency', self._normalize_currency),
+            _Stage('percentage', self._normalize_percentage),
+            _Stage('units', self._normalize_units),
+            _Stage('time', self._normalize_time),
+            _Stage('date', self._normalize_date),
+            _Stage('phone', self._normalize_phone),
+            _Stage('numbers', self._normalize_numbers),
+            _Stage('number_to_words', self._number_to_words),
+            _Stage('special_chars', self._normalize_special_chars),
+            _Stage('whitespace', self._normalize_whitespace),
+        ]
+
+    def _compile_units(self):
+        """
+        Compile the unit table into one alternation per unit pass, longest unit
+        first. Each unit is its own group, so `match.lastindex` names the unit
+        that matched, exactly as the former per-unit `re.sub` passes did.
+        """
+        sorted_units = sorted(self.units.items(), key=lambda x: len(x[0]), reverse=True)
+
+        self._unit_names = [full_name for _, full_name in sorted_units]
+        alternation = '|'.join(f'({re.escape(unit)})' for unit, _ in sorted_units)
+        self._number_unit_re = re.compile(r'(\d+(?:[.,]\d+)?)\s*(?:' + alternation + r')\b', re.IGNORECASE)
+
+        power_units = [(unit, full_name) for unit, full_name in sorted_units if any(c in unit for c in '²³°')]
+        self._power_unit_names = [full_name for _, full_name in power_units]
+        alternation = '|'.join(f'({re.escape(unit)})' for unit, _ in power_units)
+        self._power_unit_re = re.compile(r'\b(?:' + alternation + r')\b', re.IGNORECASE)
+
+    def _compile_number_words(self):
+        """
+        Tabulate the reading of every three-digit group: `_group_words[n]` as
+        read on its own, `_padded_group_words[n]` after a thousands group,
+        where e.g. 5 reads "không trăm năm".
+        """
+        self._group_words = [self._read_three_digits(n) for n in range(1000)]
+        self._padded_group_words = [
+            f"không trăm {self._read_two_digits(n)}" if n < 100 else self._group_words[n]
+            for n in range(1000)
+        ]
+
     def normalize(self, text):
         """Main normalization pipeline."""
         text = text.lower()
-        text = self._normalize_temperature(text)
-        text = self._normalize_currency(text)
-        text = self._normalize_percentage(text)
-        text = self._normalize_units(text)
-        text = self._normalize_time(text)
-        text = self._normalize_date(text)
-        text = self._normalize_phone(text)
-        text = self._normalize_numbers(text)
-        text = self._number_to_words(text)
-        text = self._normalize_special_chars(text)
-        text = self._normalize_whitespace(text)
+        if self.profile:
+            for stage in self._stages:
+                text = stage.timed(text)
+        else:
+            for stage in self._stages:
+                text = stage.fn(text)
         return text
-    
+
+    def normalize_many(self, texts):
+        """
+        Normalize a list of texts, e.g. the sentences of a document. Runs each
+        stage over the whole list before the next one, so profiling costs one
+        timer per stage instead of one per stage and text.
+        """
+        texts = [text.lower() for text in texts]
+        for stage in self._stages:
+            if self.profile:
+                texts = stage.timed_many(texts)
+            else:
+                texts = [stage.fn(text) for text in texts]
+        return texts
+
+    def get_stage_stats(self):
+        """Per-stage totals recorded while `profile` is enabled, in pipeline order."""
+        return {stage.name: stage.stats() for stage in self._stages}
+
+    def reset_stage_stats(self):
+        for stage in self._stages:
+            stage.reset()
+
     def _normalize_temperature(self, text):
         """Convert temperature notation to words."""
-        text = re.sub(r'-(\d+(?:[.,]\d+)?)\s*°\s*c\b', r'âm \1 độ xê', text, flags=re.IGNORECASE)
-        text = re.sub(r'-(\d+(?:[.,]\d+)?)\s*°\s*f\b', r'âm \1 độ ép', text, flags=re.IGNORECASE)
-        text = re.sub(r'(\d+(?:[.,]\d+)?)\s*°\s*c\b', r'\1 độ xê', text, flags=re.IGNORECASE)
-        text = re.sub(r'(\d+(?:[.,]\d+)?)\s*°\s*f\b', r'\1 độ ép', text, flags=re.IGNORECASE)
-        text = re.sub(r'°', ' độ ', text)
+        for pattern, repl in _TEMPERATURE_RULES:
+            text = pattern.sub(repl, text)
         return text
-    
+
+    def _decimal_currency(self, match):
+        whole = match.group(1)
+        decimal = match.group(2)
+        unit = match.group(3)
+        decimal_words = ' '.join([self.digits[int(d)] for d in decimal])
+        unit_word = _CURRENCY_MULTIPLIERS.get(unit.lower(), unit)
+        return f"{whole} phẩy {decimal_words} {unit_word}"
+
     def _normalize_currency(self, text):
         """Convert currency notation to words."""
-        def decimal_currency(match):
-            whole = match.group(1)
-            decimal = match.group(2)
-            unit = match.group(3)
-            decimal_words = ' '.join([self.digits[int(d)] for d in decimal])
-            unit_map = {'k': 'nghìn', 'm': 'triệu', 'b': 'tỷ'}
-            unit_word = unit_map.get(unit.lower(), unit)
-            return f"{whole} phẩy {decimal_words} {unit_word}"
-        
-        text = re.sub(r'(\d+)[.,](\d+)\s*([kmb])\b', decimal_currency, text, flags=re.IGNORECASE)
-        text = re.sub(r'(\d+)\s*k\b', r'\1 nghìn', text, flags=re.IGNORECASE)
-        text = re.sub(r'(\d+)\s*m\b', r'\1 triệu', text, flags=re.IGNORECASE)
-        text = re.sub(r'(\d+)\s*b\b', r'\1 tỷ', text, flags=re.IGNORECASE)
-        text = re.sub(r'(\d+(?:[.,]\d+)?)\s*đ\b', r'\1 đồng', text)
-        text = re.sub(r'(\d+(?:[.,]\d+)?)\s*vnd\b', r'\1 đồng', text, flags=re.IGNORECASE)
-        text = re.sub(r'\$\s*(\d+(?:[.,]\d+)?)', r'\1 đô la', text)
-        text = re.sub(r'(\d+(?:[.,]\d+)?)\s*\$', r'\1 đô la', text)
+        text = _DECIMAL_CURRENCY_RE.sub(self._decimal_currency, text)
+        for pattern, repl in _CURRENCY_RULES:
+            text = pattern.sub(repl, text)
         return text
-    
+
     def _normalize_percentage(self, text):
         """Convert percentage to words."""
-        text = re.sub(r'(\d+(?:[.,]\d+)?)\s*%', r'\1 phần trăm', text)
-        return text
-    
+        return _PERCENTAGE_RE.sub(r'\1 phần trăm', text)
+
+    def _expand_compound_with_number(self, match):
+        number = match.group(1)
+        unit1 = match.group(2).lower()
+        unit2 = match.group(3).lower()
+        full_unit1 = self.units.get(unit1, unit1)
+        full_unit2 = self.units.get(unit2, unit2)
+        return f"{number} {full_unit1} trên {full_unit2}"
+
+    def _expand_compound_without_number(self, match):
+        unit1 = match.group(1).lower()
+        unit2 = match.group(2).lower()
+        full_unit1 = self.units.get(unit1, unit1)
+        full_unit2 = self.units.get(unit2, unit2)
+        return f"{full_unit1} trên {full_unit2}"
+
     def _normalize_units(self, text):
         """Convert measurement units to words."""
-        def expand_compound_with_number(match):
-            number = match.group(1)
-            unit1 = match.group(2).lower()
-            unit2 = match.group(3).lower()
-            full_unit1 = self.units.get(unit1, unit1)
-            full_unit2 = self.units.get(unit2, unit2)
-            return f"{number} {full_unit1} trên {full_unit2}"
-        
-        def expand_compound_without_number(match):
-            unit1 = match.group(1).lower()
-            unit2 = match.group(2).lower()
-            full_unit1 = self.units.get(unit1, unit1)
-            full_unit2 = self.units.get(unit2, unit2)
-            return f"{full_unit1} trên {full_unit2}"
-        
-        text = re.sub(r'(\d+(?:[.,]\d+)?)\s*([a-zA-Zμµ²³°]+)/([a-zA-Zμµ²³°0-9]+)\b', 
-                     expand_compound_with_number, text)
-        text = re.sub(r'\b([a-zA-Zμµ²³°]+)/([a-zA-Zμµ²³°0-9]+)\b', 
-                     expand_compound_without_number, text)
-        
-        sorted_units = sorted(self.units.items(), key=lambda x: len(x[0]), reverse=True)
-        for unit, full_name in sorted_units:
-            pattern = r'(\d+(?:[.,]\d+)?)\s*' + re.escape(unit) + r'\b'
-            text = re.sub(pattern, rf'\1 {full_name}', text, flags=re.IGNORECASE)
-        
-        for unit, full_name in sorted_units:
-            if any(c in unit for c in '²³°'):
-                pattern = r'\b' + re.escape(unit) + r'\b'
-                text = re.sub(pattern, full_name, text, flags=re.IGNORECASE)
-        
+        text = _COMPOUND_UNIT_WITH_NUMBER_RE.sub(self._expand_compound_with_number, text)
+        text = _COMPOUND_UNIT_RE.sub(self._expand_compound_without_number, text)
+
+        # Group 1 is the number, group i + 2 the i-th unit
+        text = self._number_unit_re.sub(
+            lambda m: f"{m.group(1)} {self._unit_names[m.lastindex - 2]}", text)
+        text = self._power_unit_re.sub(
+            lambda m: self._power_unit_names[m.lastindex - 1], text)
+
         return text
-    
+
+    @staticmethod
+    def _validate_and_convert_time(match):
+        """Validate time components before converting."""
+        groups = match.groups()
+
+        # HH:MM:SS format
+        if len(groups) == 3:
+            hour, minute, second = groups
+            hour_int, minute_int, second_int = int(hour), int(minute), int(second)
+
+            # Validate ranges
+            if not (0 <= hour_int <= 23):
+                return match.group(0)  # Return original if invalid
+            if not (0 <= minute_int <= 59):
+                return match.group(0)
+            if not (0 <= second_int <= 59):
+                return match.group(0)
+
+            return f"{hour} giờ {minute} phút {second} giây"
+
+        # HH:MM or HHhMM format
+        elif len(groups) == 2:
+            hour, minute = groups
+            hour_int, minute_int = int(hour), int(minute)
+
+            # Validate ranges
+            if not (0 <= hour_int <= 23):
+                return match.group(0)
+            if not (0 <= minute_int <= 59):
+                return match.group(0)
+
+            return f"{hour} giờ {minute} phút"
+
+        # HHh format
+        else:
+            hour = groups[0]
+            hour_int = int(hour)
+
+            if not (0 <= hour_int <= 23):
+                return match.group(0)
+
+            return f"{hour} giờ"
+
     def _normalize_time(self, text):
         """Convert time notation to words with validation."""
-        
-        def validate_and_convert_time(match):
-            """Validate time components before converting."""
-            groups = match.groups()
-            
-            # HH:MM:SS format
-            if len(groups) == 3:
-                hour, minute, second = groups
-                hour_int, minute_int, second_int = int(hour), int(minute), int(second)
-                
-                # Validate ranges
-                if not (0 <= hour_int <= 23):
-                    return match.group(0)  # Return original if invalid
-                if not (0 <= minute_int <= 59):
-                    return match.group(0)
-                if not (0 <= second_int <= 59):
-                    return match.group(0)
-                
-                return f"{hour} giờ {minute} phút {second} giây"
-            
-            # HH:MM or HHhMM format
-            elif len(groups) == 2:
-                hour, minute = groups
-                hour_int, minute_int = int(hour), int(minute)
-                
-                # Validate ranges
-                if not (0 <= hour_int <= 23):
-                    return match.group(0)
-                if not (0 <= minute_int <= 59):
-                    return match.group(0)
-                
-                return f"{hour} giờ {minute} phút"
-            
-            # HHh format
-            else:
-                hour = groups[0]
-                hour_int = int(hour)
-                
-                if not (0 <= hour_int <= 23):
-                    return match.group(0)
-                
-                return f"{hour} giờ"
-        
-        # Apply patterns with validation
-        text = re.sub(r'(\d{1,2}):(\d{2}):(\d{2})', validate_and_convert_time, text)
-        text = re.sub(r'(\d{1,2}):(\d{2})', validate_and_convert_time, text)
-        text = re.sub(r'(\d{1,2})h(\d{2})', validate_and_convert_time, text)
-        text = re.sub(r'(\d{1,2})h\b', validate_and_convert_time, text)
-        
+        for pattern in _TIME_PATTERNS:
+            text = pattern.sub(self._validate_and_convert_time, text)
         return text
-    
+
+    @staticmethod
+    def _is_valid_date(day, month, year):
+        """Check if date components are valid."""
+        day, month, year = int(day), int(month), int(year)
+
+        # Basic range checks
+        if not (1 <= day <= 31):
+            return False
+        if not (1 <= month <= 12):
+            return False
+
+        return True
+
+    @classmethod
+    def _date_to_text(cls, match):
+        day, month, year = match.groups()
+        if cls._is_valid_date(day, month, year):
+            return f"ngày {day} tháng {month} năm {year}"
+        return match.group(0)  # Return original if invalid
+
+    @classmethod
+    def _date_iso_to_text(cls, match):
+        year, month, day = match.groups()
+        if cls._is_valid_date(day, month, year):
+            return f"ngày {day} tháng {month} năm {year}"
+        return match.group(0)
+
+    @classmethod
+    def _date_short_year(cls, match):
+        day, month, year = match.groups()
+        full_year = f"20{year}" if int(year) < 50 else f"19{year}"
+        if cls._is_valid_date(day, month, full_year):
+            return f"ngày {day} tháng {month} năm {full_year}"
+        return match.group(0)
+
     def _normalize_date(self, text):
         """Convert date notation to words with validation."""
-        
-        def is_valid_date(day, month, year):
-            """Check if date components are valid."""
-            day, month, year = int(day), int(month), int(year)
-            
-            # Basic range checks
-            if not (1 <= day <= 31):
-                return False
-            if not (1 <= month <= 12):
-                return False
-
-            return True
-        
-        def date_to_text(match):
-            day, month, year = match.groups()
-            if is_valid_date(day, month, year):
-                return f"ngày {day} tháng {month} năm {year}"
-            return match.group(0)  # Return original if invalid
-        
-        def date_iso_to_text(match):
-            year, month, day = match.groups()
-            if is_valid_date(day, month, year):
-                return f"ngày {day} tháng {month} năm {year}"
-            return match.group(0)
-        
-        def date_short_year(match):
-            day, month, year = match.groups()
-            full_year = f"20{year}" if int(year) < 50 else f"19{year}"
-            if is_valid_date(day, month, full_year):
-                return f"ngày {day} tháng {month} năm {full_year}"
-            return match.group(0)
-        
-        # Apply patterns with validation
-        text = re.sub(r'\bngày\s+(\d{1,2})[/\-](\d{1,2})[/\-](\d{4})\b', 
-                    lambda m: date_to_text(m).replace('ngày ngày', 'ngày'), text)
-        text = re.sub(r'\bngày\s+(\d{1,2})[/\-](\d{1,2})[/\-](\d{2})\b', 
-                    lambda m: date_short_year(m).replace('ngày ngày', 'ngày'), text)
-        text = re.sub(r'\b(\d{4})-(\d{1,2})-(\d{1,2})\b', date_iso_to_text, text)
-        text = re.sub(r'\b(\d{1,2})[/\-](\d{1,2})[/\-](\d{4})\b', date_to_text, text)
-        text = re.sub(r'\b(\d{1,2})[/\-](\d{1,2})[/\-](\d{2})\b', date_short_year, text)
-        
+        text = _PREFIXED_DATE_RE.sub(
+            lambda m: self._date_to_text(m).replace('ngày ngày', 'ngày'), text)
+        text = _PREFIXED_DATE_SHORT_YEAR_RE.sub(
+            lambda m: self._date_short_year(m).replace('ngày ngày', 'ngày'), text)
+        text = _ISO_DATE_RE.sub(self._date_iso_to_text, text)
+        text = _DATE_RE.sub(self._date_to_text, text)
+        text = _DATE_SHORT_YEAR_RE.sub(self._date_short_year, text)
         return text
-    
+
+    def _phone_to_text(self, match):
+        phone = _NON_DIGIT_RE.sub('', match.group(0))
+
+        if phone.startswith('84') and len(phone) >= 10:
+            phone = '0' + phone[2:]
+
+        if 10 <= len(phone) <= 11:
+            words = [self.digits[int(d)] for d in phone]
+            return ' '.join(words) + ' '
+
+        return match.group(0)
+
     def _normalize_phone(self, text):
         """Convert phone numbers to digit-by-digit reading."""
-        def phone_to_text(match):
-            phone = match.group(0)
-            phone = re.sub(r'[^\d]', '', phone)
-            
-            if phone.startswith('84') and len(phone) >= 10:
-                phone = '0' + phone[2:]
-            
-            if 10 <= len(phone) <= 11:
-                words = [self.digits[int(d)] for d in phone]
-                return ' '.join(words) + ' '
-            
-            return match.group(0)
-        
-        text = re.sub(r'(\+84|84)[\s\-\.]?\d[\d\s\-\.]{7,}', phone_to_text, text)
-        text = re.sub(r'\b0\d[\d\s\-\.]{8,}', phone_to_text, text)
+        text = _INTERNATIONAL_PHONE_RE.sub(self._phone_to_text, text)
+        text = _PHONE_RE.sub(self._phone_to_text, text)
         return text
-    
+
+    def _decimal_to_words(self, match):
+        whole = match.group(1)
+        decimal = match.group(2)
+        decimal_words = ' '.join([self.digits[int(d)] for d in decimal])
+        separator = 'phẩy' if ',' in match.group(0) else 'chấm'
+        return f"{whole} {separator} {decimal_words}"
+
     def _normalize_numbers(self, text):
-        text = re.sub(r'(\d+(?:[,.]\d+)?)%', lambda m: f'{m.group(1)} phần trăm', text)
+        text = _PERCENT_SIGN_RE.sub(lambda m: f'{m.group(1)} phần trăm', text)
         # 1. Xóa dấu thousand separator trước
-        text = re.sub(r'(\d{1,3})(?:\.(\d{3}))+', lambda m: m.group(0).replace('.', ''), text)
-    
+        text = _THOUSANDS_RE.sub(lambda m: m.group(0).replace('.', ''), text)
+
         # 2. Chuyển số thập phân thành chữ
-        def decimal_to_words(match):
-            whole = match.group(1)
-            decimal = match.group(2)
-            decimal_words = ' '.join([self.digits[int(d)] for d in decimal])
-            separator = 'phẩy' if ',' in match.group(0) else 'chấm'
-            return f"{whole} {separator} {decimal_words}"
-        
         # 2a. Dấu phẩy
-        text = re.sub(r'(\d+),(\d+)', decimal_to_words, text)
+        text = _DECIMAL_COMMA_RE.sub(self._decimal_to_words, text)
         # 2b. Dấu chấm (1-2 chữ số thập phân)
-        text = re.sub(r'(\d+)\.(\d{1,2})\b', decimal_to_words, text)
-        
+        text = _DECIMAL_POINT_RE.sub(self._decimal_to_words, text)
+
         return text
     
     def _read_two_digits(self, n):
@@ -314,64 +455,40 @@ class VietnameseTTSNormalizer:
         if num < 0:
             return f"âm {self._convert_number_to_words(-num)}"
         
+        # Same readings as reading each group with _read_three_digits, looked up
+        parts = []
         if num >= 1000000000:
-            billion = num // 1000000000
-            remainder = num % 1000000000
-            result = f"{self._read_three_digits(billion)} tỷ"
-            if remainder > 0:
-                result += f" {self._convert_number_to_words(remainder)}"
-            return result
-        
-        elif num >= 1000000:
-            million = num // 1000000
-            remainder = num % 1000000
-            result = f"{self._read_three_digits(million)} triệu"
-            if remainder > 0:
-                result += f" {self._convert_number_to_words(remainder)}"
-            return result
-        
-        elif num >= 1000:
-            thousand = num // 1000
-            remainder = num % 1000
-            result = f"{self._read_three_digits(thousand)} nghìn"
-            if remainder > 0:
-                if remainder < 100:
-                    result += f" không trăm {self._read_two_digits(remainder)}"
-                else:
-                    result += f" {self._read_three_digits(remainder)}"
-            return result
-        
-        else:
-            return self._read_three_digits(num)
+            billion, num = divmod(num, 1000000000)
+            parts.append(f"{self._group_words[billion]} tỷ")
+        if num >= 1000000:
+            million, num = divmod(num, 1000000)
+            parts.append(f"{self._group_words[million]} triệu")
+        if num >= 1000:
+            thousand, num = divmod(num, 1000)
+            parts.append(f"{self._group_words[thousand]} nghìn")
+            if num > 0:
+                parts.append(self._padded_group_words[num])
+        elif num > 0:
+            parts.append(self._group_words[num])
+        return ' '.join(parts)
     
     def _number_to_words(self, text):
         """Convert all remaining numbers to words."""
-        def convert_number(match):
-            num = int(match.group(0))
-            return self._convert_number_to_words(num)
-        
-        text = re.sub(r'\b\d+\b', convert_number, text)
-        return text
-    
+        return _INTEGER_RE.sub(lambda m: self._convert_number_to_words(int(m.group(0))), text)
+
     def _normalize_special_chars(self, text):
         """Handle special characters."""
         text = text.replace('&', ' và ')
         text = text.replace('+', ' cộng ')
         text = text.replace('=', ' bằng ')
         text = text.replace('#', ' thăng ')
-        text = re.sub(r'[\[\]\(\)\{\}]', ' ', text)
-        text = re.sub(r'\s+[-–—]+\s+', ' ', text)
-        text = re.sub(r'\.{2,}', ' ', text)
-        text = re.sub(r'\s+\.\s+', ' ', text)
-        text = re.sub(r'[^\w\sàáảãạăắằẳẵặâấầẩẫậèéẻẽẹêếềểễệìíỉĩịòóỏõọôốồổỗộơớờởỡợùúủũụưứừửữựỳýỷỹỵđ.,!?;:@%]', ' ', text)
+        for pattern in _SPECIAL_CHAR_PATTERNS:
+            text = pattern.sub(' ', text)
         return text
-    
+
     def _normalize_whitespace(self, text):
         """Normalize whitespace."""
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
-        return text
-
+        return _WHITESPACE_RE.sub(' ', text).strip()
 
 if __name__ == "__main__":
     normalizer = VietnameseTTSNormalizer()
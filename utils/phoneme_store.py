@@ -0,0 +1,366 @@
+"""
+Compiled phoneme dictionary: a sorted string table in one binary file.
+
+Layout (little-endian):
+    magic "VNPHDICT" | version u32 | count u32
+    key offsets   (count + 1) x u32, absolute file offsets
+    value offsets (count + 1) x u32, absolute file offsets
+    keys blob     UTF-8 words, sorted by bytes
+    values blob   UTF-8 phonemes, in key order
+
+The file is memory-mapped, so every worker process shares the same pages
+through the page cache, and a lookup is a binary search over the keys.
+
+Build it from the JSON dictionary with:
+    python -m utils.phoneme_store [utils/phoneme_dict.json] [utils/phoneme_dict.bin]
+"""
+import os
+import sys
+import json
+import mmap
+import struct
+import threading
+import time
+import atexit
+from array import array
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+MAGIC = b"VNPHDICT"
+VERSION = 1
+_HEADER = struct.Struct("<8sII")
+
+
+def compile_phoneme_dict(json_path: str, bin_path: str) -> int:
+    """Compile the JSON phoneme dictionary into the binary table, returns the entry count."""
+    with open(json_path, "r", encoding="utf-8") as f:
+        entries = sorted((word.encode("utf-8"), phones.encode("utf-8")) for word, phones in json.load(f).items())
+
+    count = len(entries)
+    keys_start = _HEADER.size + 2 * 4 * (count + 1)
+    key_offsets, value_offsets = array("I", [keys_start]), array("I")
+    for key, _ in entries:
+        key_offsets.append(key_offsets[-1] + len(key))
+    value_offsets.append(key_offsets[-1])
+    for _, value in entries:
+        value_offsets.append(value_offsets[-1] + len(value))
+    if sys.byteorder != "little":
+        key_offsets.byteswap()
+        value_offsets.byteswap()
+
+    tmp_path = bin_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, count))
+        f.write(key_offsets.tobytes())
+        f.write(value_offsets.tobytes())
+        f.write(b"".join(key for key, _ in entries))
+        f.write(b"".join(value for _, value in entries))
+    os.replace(tmp_path, bin_path)
+    return count
+
+
+class _SortedStringTable:
+    """Read-only view of a compiled phoneme dictionary."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} phoneme dictionary.")
+        self._count = count
+        offsets = memoryview(self._mm)[_HEADER.size : _HEADER.size + 2 * 4 * (count + 1)].cast("I")
+        self._key_offsets = offsets[: count + 1]
+        self._value_offsets = offsets[count + 1 :]
+
+    def _key(self, i: int) -> bytes:
+        return self._mm[self._key_offsets[i] : self._key_offsets[i + 1]]
+
+    def _value(self, i: int) -> str:
+        return self._mm[self._value_offsets[i] : self._value_offsets[i + 1]].decode("utf-8")
+
+    def get(self, word: str) -> str | None:
+        key = word.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._key(lo) == key:
+            return self._value(lo)
+        return None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._key(i).decode("utf-8")
+
+
+class PhonemeDict(MutableMapping):
+    """
+    Word -> phonemes dictionary, loaded on the first lookup.
+
+    Uses the compiled table next to the JSON file when it is at least as new
+    as the JSON, and falls back to parsing the JSON otherwise. Words assigned
+    at runtime are kept in a per-process overlay.
+    """
+
+    def __init__(self, json_path: str, bin_path: str | None = None):
+        self.json_path = json_path
+        self.bin_path = bin_path or os.path.splitext(json_path)[0] + ".bin"
+        self._base = None
+        self._overlay: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _binary_is_current(self) -> bool:
+        if sys.byteorder != "little" or not os.path.exists(self.bin_path):
+            return False
+        return not os.path.exists(self.json_path) or os.path.getmtime(self.bin_path) >= os.path.getmtime(self.json_path)
+
+    def _load(self):
+        if self._base is None:
+            with self._lock:
+                if self._base is None:
+                    if self._binary_is_current():
+                        self._base = _SortedStringTable(self.bin_path)
+                    else:
+                        self._base = self._load_json()
+        return self._base
+
+    def _load_json(self) -> dict:
+        try:
+            with open(self.json_path, "r", encoding="utf-8") as f:
+                base = json.load(f)
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Phoneme dictionary not found at {self.json_path}. "
+                "Please create it or set PHONEME_DICT_PATH environment variable."
+            )
+        print(f"Note: Using {self.json_path}; build {self.bin_path} with `python -m utils.phoneme_store` "
+              "to share the dictionary between processes.")
+        return base
+
+    @property
+    def is_compiled(self) -> bool:
+        return isinstance(self._load(), _SortedStringTable)
+
+    def __getitem__(self, word: str) -> str:
+        phones = self._overlay.get(word)
+        if phones is None:
+            phones = self._load().get(word)
+            if phones is None:
+                raise KeyError(word)
+        return phones
+
+    def __contains__(self, word) -> bool:
+        return word in self._overlay or self._load().get(word) is not None
+
+    def __setitem__(self, word: str, phones: str):
+        self._overlay[word] = phones
+
+    def __delitem__(self, word: str):
+        del self._overlay[word]
+
+    def __iter__(self):
+        yield from self._overlay
+        for word in self._load():
+            if word not in self._overlay:
+                yield word
+
+    def __len__(self) -> int:
+        base = self._load()
+        return len(base) + sum(1 for word in self._overlay if base.get(word) is None)
+
+
+@contextmanager
+def _file_lock(path: str):
+    """Exclusive lock on `path + ".lock"`, held across processes"""
+    with open(path + ".lock", "a+") as f:
+        if os.name == "nt":
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK gives up after ~10 s
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class OOVPhonemeCache:
+    """
+    Bounded LRU of phonemes for out-of-dictionary words, persisted to an
+    append-only JSON-lines file.
+
+    New words are appended in batches (every `flush_every` words or
+    `flush_interval` seconds, and at exit). The file is replayed on the first
+    lookup, later lines winning, and rewritten with only the live entries
+    once it holds more than twice `max_entries` lines.
+
+    Several processes may share the file: every write holds a lock file next
+    to it, and a rewrite first merges in the entries other processes appended.
+
+    The first line records `version`. A file written with another version
+    (or none) is ignored and replaced on the next flush, so a change of the
+    phonemizer output does not serve stale entries.
+    """
+
+    def __init__(self, path: str | None, max_entries: int = 50_000, flush_every: int = 64, flush_interval: float = 30.0,
+                 version: int = 0):
+        self.path = path
+        self.version = version
+        self.max_entries = max_entries
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._pending: list[tuple[str, str]] = []
+        self._file_lines = 0
+        self._last_flush = time.monotonic()
+        self._loaded = path is None
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        if path is not None:
+            atexit.register(self.flush)
+
+    def _store_current(self) -> bool | None:
+        """Whether the file holds this version, None when it is missing or empty"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                first = f.readline()
+        except FileNotFoundError:
+            return None
+        if not first:
+            return None
+        try:
+            header = json.loads(first)
+        except ValueError:
+            return False
+        return isinstance(header, dict) and header.get("version") == self.version
+
+    def _read_store(self) -> list[tuple[str, str]]:
+        """(word, phones) lines of the file, after its header"""
+        entries = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            f.readline()
+            for line in f:
+                try:
+                    word, phones = json.loads(line)
+                except (ValueError, TypeError):
+                    continue  # torn write from a crash
+                entries.append((word, phones))
+        return entries
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            current = self._store_current()
+            if current is None:
+                return
+            if not current:
+                print(f"Note: {self.path} is from another frontend version, starting it over.")
+                return
+            entries = self._read_store()
+        except OSError as e:
+            print(f"Warning: Could not read {self.path}: {e}")
+            return
+        self._file_lines = len(entries)
+        for word, phones in entries:
+            self._entries[word] = phones
+            self._entries.move_to_end(word)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, word: str) -> str | None:
+        with self._lock:
+            self._load()
+            phones = self._entries.get(word)
+            if phones is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(word)
+            return phones
+
+    def put(self, word: str, phones: str):
+        with self._lock:
+            self._load()
+            self._entries[word] = phones
+            self._entries.move_to_end(word)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if self.path is None:
+                return
+            self._pending.append((word, phones))
+            if len(self._pending) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+
+    def flush(self):
+        """Append pending words to the store, compacting it when it grew too long"""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if self.path is None or not self._pending:
+                return
+            try:
+                with _file_lock(self.path):
+                    current = self._store_current()
+                    if current is False or self._file_lines + len(self._pending) > 2 * self.max_entries:
+                        self._compact(merge=current is True)
+                    else:
+                        with open(self.path, "a", encoding="utf-8") as f:
+                            if current is None:
+                                f.write(json.dumps({"version": self.version}) + "\n")
+                            f.writelines(json.dumps(item, ensure_ascii=False) + "\n" for item in self._pending)
+                        self._file_lines += len(self._pending)
+                self._pending.clear()
+            except OSError as e:
+                print(f"Warning: Could not write {self.path}: {e}")
+
+    def _compact(self, merge: bool):
+        """Rewrite the file with the live entries, after the ones on disk when `merge` (file lock held)"""
+        entries = OrderedDict()
+        for word, phones in (*(self._read_store() if merge else ()), *self._entries.items()):
+            entries[word] = phones
+            entries.move_to_end(word)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"version": self.version}) + "\n")
+            f.writelines(json.dumps(item, ensure_ascii=False) + "\n" for item in entries.items())
+        os.replace(tmp_path, self.path)
+        self._file_lines = len(entries)
+
+    def stats(self) -> dict:
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+if __name__ == "__main__":
+    default_json = os.path.join(os.path.dirname(__file__), "phoneme_dict.json")
+    json_path = sys.argv[1] if len(sys.argv) > 1 else os.getenv("PHONEME_DICT_PATH", default_json)
+    bin_path = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(json_path)[0] + ".bin"
+    count = compile_phoneme_dict(json_path, bin_path)
+    print(f"Compiled {count} entries: {json_path} -> {bin_path} ({os.path.getsize(bin_path) / 1024:.0f} KB)")
@@ -2,15 +2,25 @@ import os
 import json
 import platform
 import glob
-from phonemizer import phonemize
-from phonemizer.backend.espeak.espeak import EspeakWrapper
+import threading
+from collections import OrderedDict
 from utils.normalize_text import VietnameseTTSNormalizer
+from utils.phoneme_store import PhonemeDict, OOVPhonemeCache
 
 # Configuration
 PHONEME_DICT_PATH = os.getenv(
     'PHONEME_DICT_PATH',
     os.path.join(os.path.dirname(__file__), "phoneme_dict.json")
 )
+# Append-only store of phonemized out-of-dictionary words ("" disables it)
+OOV_CACHE_PATH = os.getenv(
+    'PHONEME_OOV_CACHE_PATH',
+    os.path.join(os.path.dirname(__file__), "oov_phonemes.jsonl")
+)
+OOV_CACHE_SIZE = int(os.getenv('PHONEME_OOV_CACHE_SIZE', '50000'))
+# Bump when normalization or phonemization output changes; keys the in-memory
+# frontend caches and is stored in the persisted ones (OOV store, reference phonemes)
+FRONTEND_VERSION = 1
 
 def load_phoneme_dict(path=PHONEME_DICT_PATH):
     """Load phoneme dictionary from JSON file."""
@@ -41,6 +51,7 @@ def setup_espeak_library():
 
 def _setup_windows_espeak():
     """Setup eSpeak for Windows."""
+    from phonemizer.backend.espeak.espeak import EspeakWrapper
     default_path = r"C:\Program Files\eSpeak NG\libespeak-ng.dll"
     if os.path.exists(default_path):
         EspeakWrapper.set_library(default_path)
@@ -52,6 +63,7 @@ def _setup_windows_espeak():
 
 def _setup_linux_espeak():
     """Setup eSpeak for Linux."""
+    from phonemizer.backend.espeak.espeak import EspeakWrapper
     search_patterns = [
         "/usr/lib/x86_64-linux-gnu/libespeak-ng.so*",
         "/usr/lib/x86_64-linux-gnu/libespeak.so*",
@@ -76,6 +88,7 @@ def _setup_linux_espeak():
 
 def _setup_macos_espeak():
     """Setup eSpeak for macOS."""
+    from phonemizer.backend.espeak.espeak import EspeakWrapper
     espeak_lib = os.environ.get('PHONEMIZER_ESPEAK_LIBRARY')
     
     paths_to_check = [
@@ -96,55 +109,156 @@ def _setup_macos_espeak():
         "Or set: export PHONEMIZER_ESPEAK_LIBRARY=/path/to/libespeak-ng.dylib"
     )
 
-# Initialize
-try:
-    setup_espeak_library()
-    phoneme_dict = load_phoneme_dict()
-    normalizer = VietnameseTTSNormalizer()
-except Exception as e:
-    print(f"Initialization error: {e}")
-    raise
+# Compiled table (phoneme_dict.bin) if built, else the JSON; loaded on first lookup
+phoneme_dict = PhonemeDict(PHONEME_DICT_PATH)
+# Words missing from the dictionary, persisted across restarts
+oov_cache = OOVPhonemeCache(OOV_CACHE_PATH or None, max_entries=OOV_CACHE_SIZE, version=FRONTEND_VERSION)
+
+# espeak and the normalizer are set up on first use, so importing this module
+# (e.g. through vieneu_tts for the admin UI or `--help`) stays cheap
+_init_lock = threading.Lock()
+_normalizer = None
+
+def _initialize():
+    """Locate the espeak library and build the normalizer, once per process."""
+    global _normalizer
+    if _normalizer is not None:
+        return _normalizer
+    with _init_lock:
+        if _normalizer is None:
+            try:
+                setup_espeak_library()
+                _normalizer = VietnameseTTSNormalizer()
+            except Exception as e:
+                print(f"Initialization error: {e}")
+                raise
+    return _normalizer
+
+def get_normalizer() -> VietnameseTTSNormalizer:
+    """Shared text normalizer (initializes espeak on first use)."""
+    return _initialize()
+
+def __getattr__(name):
+    # `normalizer` used to be created at import time
+    if name == "normalizer":
+        return get_normalizer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# One espeak backend per thread: construction loads the library and the
+# voice, while espeak itself is not safe to share between threads
+_espeak = threading.local()
+
+def get_espeak_backend():
+    """Initialized Vietnamese espeak backend of the calling thread."""
+    backend = getattr(_espeak, "backend", None)
+    if backend is None:
+        from phonemizer.backend import EspeakBackend
+        _initialize()
+        backend = EspeakBackend(
+            "vi",
+            preserve_punctuation=True,
+            with_stress=True,
+            language_switch="remove-flags"
+        )
+        _espeak.backend = backend
+    return backend
+
+def espeak_phonemize(texts: list[str]) -> list[str]:
+    """Phonemize each text with the thread's espeak backend."""
+    from phonemizer.separator import default_separator
+    return get_espeak_backend().phonemize(texts, separator=default_separator, strip=False)
 
 def phonemize_text(text: str) -> str:
     """Convert text to phonemes using phonemizer."""
-    text = normalizer.normalize(text)
-    return phonemize(
-        text,
-        language="vi",
-        backend="espeak",
-        preserve_punctuation=True,
-        with_stress=True,
-        language_switch="remove-flags"
-    )
+    text = get_normalizer().normalize(text)
+    # Like phonemizer.phonemize: one utterance per non-empty line
+    lines = [line for line in text.splitlines() if line.strip()]
+    return "\n".join(espeak_phonemize(lines)) if lines else ""
 
-def phonemize_with_dict(text: str, phoneme_dict=phoneme_dict) -> str:
-    """Phonemize text with dictionary lookup."""
-    text = normalizer.normalize(text)
-    words = text.split()
-    result = []
-    
-    for word in words:
-        if word in phoneme_dict:
-            phone_word = phoneme_dict[word]
-        else:
+def _phonemize_oov(words: list[str]) -> list[str]:
+    """Phonemize out-of-dictionary words with espeak in one batched call."""
+    try:
+        phones = espeak_phonemize(words)
+    except Exception:
+        phones = None
+
+    if phones is None or len(phones) != len(words):
+        # Isolate the failing words; the others still get phonemized
+        phones = []
+        for word in words:
             try:
-                phone_word = phonemize(
-                    word,
-                    language='vi',
-                    backend='espeak',
-                    preserve_punctuation=True,
-                    with_stress=True,
-                    language_switch='remove-flags'
-                )
-                
-                if word.lower().startswith('r'):
-                    phone_word = 'ɹ' + phone_word[1:]
-                
-                phoneme_dict[word] = phone_word
+                phones.append(espeak_phonemize([word])[0])
             except Exception as e:
                 print(f"Warning: Could not phonemize '{word}': {e}")
-                phone_word = word
-        
+                phones.append(None)
+
+    result = []
+    for word, phone_word in zip(words, phones):
+        if phone_word is not None and word.lower().startswith('r'):
+            phone_word = 'ɹ' + phone_word[1:]
         result.append(phone_word)
-    
-    return ' '.join(result)
\ No newline at end of file
+    return result
+
+def phonemize_with_dict(text: str, phoneme_dict=phoneme_dict, oov_cache=oov_cache) -> str:
+    """Phonemize text with dictionary lookup, then the OOV cache (new words in one espeak call)."""
+    text = get_normalizer().normalize(text)
+    words = text.split()
+
+    phones = {}
+    for word in words:
+        if word not in phones:
+            phones[word] = phoneme_dict.get(word) or oov_cache.get(word)
+
+    oov = [word for word, phone_word in phones.items() if phone_word is None]
+    if oov:
+        for word, phone_word in zip(oov, _phonemize_oov(oov)):
+            if phone_word is not None:
+                oov_cache.put(word, phone_word)
+                phones[word] = phone_word
+
+    return ' '.join(phones[word] or word for word in words)
+
+# Phonemized reference transcripts, keyed by the raw transcript
+REFERENCE_PHONEMES_MAX = 256
+_reference_phonemes = OrderedDict()
+_reference_lock = threading.Lock()
+
+def phonemize_reference(ref_text: str, text_path: str | None = None) -> str:
+    """
+    Phonemize a reference transcript once per voice.
+
+    The result is kept in memory and, when `text_path` is given, persisted
+    next to it as `<name>.phonemes.json`. The stored transcript and
+    FRONTEND_VERSION are compared on load, so editing the `.txt` file or
+    changing the frontend invalidates it.
+    """
+    with _reference_lock:
+        phones = _reference_phonemes.get(ref_text)
+        if phones is not None:
+            _reference_phonemes.move_to_end(ref_text)
+            return phones
+
+    cache_path = os.path.splitext(text_path)[0] + ".phonemes.json" if text_path else None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("text") == ref_text and data.get("version") == FRONTEND_VERSION:
+                phones = data["phonemes"]
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Could not read {cache_path}: {e}")
+
+    if phones is None:
+        phones = phonemize_with_dict(ref_text)
+        if cache_path:
+            try:
+                with open(cache_path, "w", encoding="utf-8") as f:
+                    json.dump({"version": FRONTEND_VERSION, "text": ref_text, "phonemes": phones}, f, ensure_ascii=False)
+            except OSError as e:
+                print(f"Warning: Could not write {cache_path}: {e}")
+
+    with _reference_lock:
+        _reference_phonemes[ref_text] = phones
+        if len(_reference_phonemes) > REFERENCE_PHONEMES_MAX:
+            _reference_phonemes.popitem(last=False)
+    return phones
@@ -1,4 +1,4 @@
-from .vieneu_tts import VieNeuTTS, FastVieNeuTTS
-
-__all__ = ["VieNeuTTS", "FastVieNeuTTS"]
+from .vieneu_tts import VieNeuTTS, FastVieNeuTTS, StreamMetrics
+from .long_text import stream_long_text
 
+__all__ = ["VieNeuTTS", "FastVieNeuTTS", "StreamMetrics", "stream_long_text"]
@@ -0,0 +1,93 @@
+from typing import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import threading
+import numpy as np
+
+# ============================================================================
+# asyncio API
+# Async counterparts of the blocking engine entry points. Work runs on a
+# small bounded thread pool per engine, so concurrent requests await
+# instead of each pinning a serving thread for the whole generation.
+# ============================================================================
+
+_END = object()
+_executor_lock = threading.Lock()
+
+
+class AsyncInferenceMixin:
+    """
+    Adds `ainfer`, `ainfer_stream` and `ainfer_batch` to an engine exposing
+    the blocking `infer` / `infer_stream` / `infer_batch` methods.
+
+    `async_max_workers` bounds how many requests of this engine run at once
+    on each event loop (the executor's threads bound them across loops);
+    extra requests wait on the event loop without holding a thread. A stream
+    holds its slot from its first chunk until it is exhausted or closed, so
+    on single-worker engines streams never interleave on the backbone.
+    """
+
+    async_max_workers: int = 1
+
+    def _get_async_executor(self) -> ThreadPoolExecutor:
+        executor = self.__dict__.get("_async_executor")
+        if executor is None:
+            with _executor_lock:
+                executor = self.__dict__.get("_async_executor")
+                if executor is None:
+                    executor = ThreadPoolExecutor(
+                        max_workers=self.async_max_workers,
+                        thread_name_prefix=f"{type(self).__name__}-async",
+                    )
+                    self._async_executor = executor
+        return executor
+
+    def _get_async_slots(self) -> asyncio.Semaphore:
+        """Semaphore of `async_max_workers` request slots, one per event loop"""
+        loop = asyncio.get_running_loop()
+        with _executor_lock:
+            slots = self.__dict__.setdefault("_async_slots", {})
+            semaphore = slots.get(loop)
+            if semaphore is None:
+                # A semaphore references its loop, so closed loops are dropped here
+                # rather than through weak references
+                for closed in [other for other in slots if other.is_closed()]:
+                    del slots[closed]
+                semaphore = slots[loop] = asyncio.Semaphore(self.async_max_workers)
+        return semaphore
+
+    async def _run_blocking(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_async_executor(), fn, *args)
+
+    async def ainfer(self, text: str, ref_codes, ref_text: str) -> np.ndarray:
+        """Async version of `infer`."""
+        async with self._get_async_slots():
+            return await self._run_blocking(self.infer, text, ref_codes, ref_text)
+
+    async def ainfer_batch(self, texts: list[str], ref_codes, ref_text: str, max_batch_size: int = None) -> list[np.ndarray]:
+        """Async version of `infer_batch`."""
+        async with self._get_async_slots():
+            return await self._run_blocking(self.infer_batch, texts, ref_codes, ref_text, max_batch_size)
+
+    async def ainfer_stream(self, text: str, ref_codes, ref_text: str, metrics=None) -> AsyncIterator[np.ndarray]:
+        """
+        Async version of `infer_stream`.
+
+        Each chunk is produced on the executor; no thread is held between
+        chunks while the caller awaits I/O. The request slot is held for the
+        whole stream, since the backbone keeps generation state between chunks.
+        """
+        async with self._get_async_slots():
+            stream = await self._run_blocking(lambda: self.infer_stream(text, ref_codes, ref_text, metrics=metrics))
+            try:
+                while (chunk := await self._run_blocking(next, stream, _END)) is not _END:
+                    yield chunk
+            finally:
+                await self._run_blocking(stream.close)
+
+    def shutdown_async_executor(self):
+        """Release the async worker threads of this engine."""
+        executor = self.__dict__.pop("_async_executor", None)
+        if executor is not None:
+            executor.shutdown(wait=False)
@@ -0,0 +1,141 @@
+from typing import Generator, Iterable
+from queue import Queue, Empty, Full
+import threading
+import numpy as np
+
+# ============================================================================
+# Long-text streaming
+# Generates text chunks on a background thread and stitches them into one
+# continuous PCM stream with short crossfades.
+# ============================================================================
+
+_DONE = object()
+
+
+def _crossfade(tail: np.ndarray, head: np.ndarray) -> np.ndarray:
+    """Linear crossfade of the end of one chunk into the start of the next"""
+    n = min(len(tail), len(head))
+    fade_in = np.linspace(0, 1, n + 2, dtype=np.float32)[1:-1]
+    mixed = tail[len(tail) - n:] * (1 - fade_in) + head[:n] * fade_in
+    return np.concatenate([tail[:len(tail) - n], mixed, head[n:]]).astype(np.float32, copy=False)
+
+
+def _generate_chunks(tts, text_chunks, ref_codes, ref_text, queue: Queue, stop: threading.Event, errors: list):
+    """Producer: synthesize every text chunk in order and queue (chunk index, audio) pieces."""
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    try:
+        for index, text in enumerate(text_chunks):
+            if hasattr(tts, "infer_stream"):
+                pieces = tts.infer_stream(text, ref_codes, ref_text)
+            else:
+                pieces = [tts.infer(text, ref_codes, ref_text)]
+
+            for piece in pieces:
+                if piece is None or len(piece) == 0:
+                    continue
+                if not put((index, np.asarray(piece, dtype=np.float32))):
+                    if hasattr(pieces, "close"):
+                        pieces.close()
+                    return
+    except Exception as e:
+        errors.append(e)
+    finally:
+        put(_DONE)
+
+
+def stream_long_text(
+    tts,
+    text_chunks: Iterable[str],
+    ref_codes,
+    ref_text: str,
+    crossfade_ms: float = 50.0,
+    sample_rate: int = 24_000,
+    max_buffered_pieces: int = 256,
+) -> Generator[np.ndarray, None, None]:
+    """
+    Stream an arbitrarily long document as one continuous waveform.
+
+    Text chunks (e.g. from `split_text_into_chunks`) are synthesized in order
+    on a background thread, so chunk N+1 is generated while chunk N is still
+    being consumed. Consecutive chunks are joined with a short linear
+    crossfade instead of a hard cut.
+
+    Args:
+        tts: Any engine with `infer_stream` (VieNeuTTS, FastVieNeuTTS) or `infer`
+            (e.g. ColabTTSClient, which then streams one finished chunk at a time)
+        text_chunks: Text chunks in reading order, may be a lazy iterator (e.g.
+            `tts.iter_split_text(...)`); it is consumed on the producer thread
+        ref_codes: Encoded reference audio codes
+        ref_text: Reference text for reference audio
+        crossfade_ms: Crossfade length between chunks
+        sample_rate: Output sample rate
+        max_buffered_pieces: Audio pieces the generator may run ahead of the
+            consumer before it waits (bounds memory on slow consumers)
+
+    Yields:
+        Audio chunks as float32 numpy arrays
+    """
+    crossfade = int(sample_rate * crossfade_ms / 1000)
+    queue: Queue = Queue(maxsize=max_buffered_pieces)
+    stop = threading.Event()
+    errors: list = []
+    producer = threading.Thread(
+        target=_generate_chunks,
+        args=(tts, text_chunks, ref_codes, ref_text, queue, stop, errors),
+        daemon=True,
+    )
+    producer.start()
+
+    current_index = None
+    tail = np.zeros(0, dtype=np.float32)  # held back for the next crossfade
+    head = np.zeros(0, dtype=np.float32)  # start of a new chunk, not yet mixed
+    try:
+        while True:
+            try:
+                item = queue.get(timeout=0.1)
+            except Empty:
+                if not producer.is_alive() and queue.empty():
+                    break
+                continue
+            if item is _DONE:
+                break
+            index, piece = item
+
+            if index != current_index:
+                # A chunk shorter than the crossfade is mixed as soon as the next one starts
+                if len(head):
+                    tail = _crossfade(tail, head) if len(tail) else head
+                current_index = index
+                head = piece
+            elif len(head):
+                head = np.concatenate([head, piece])
+            else:
+                tail = np.concatenate([tail, piece])
+
+            # Mix the held-back tail with the new chunk once enough of it arrived
+            if len(head) and (len(head) >= crossfade or not len(tail)):
+                tail = _crossfade(tail, head) if len(tail) else head
+                head = np.zeros(0, dtype=np.float32)
+
+            if len(head) == 0 and len(tail) > crossfade:
+                yield tail[: len(tail) - crossfade]
+                tail = tail[len(tail) - crossfade:]
+
+        remainder = _crossfade(tail, head) if len(tail) and len(head) else (tail if len(tail) else head)
+        if len(remainder):
+            yield remainder
+    finally:
+        stop.set()
+        producer.join(timeout=1.0)
+
+    if errors:
+        raise errors[0]
@@ -1,12 +1,22 @@
 from pathlib import Path
-from typing import Generator
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Generator, Iterable, Iterator
 import librosa
 import numpy as np
 import torch
 from neucodec import NeuCodec, DistillNeuCodec
-from utils.phonemize_text import phonemize_with_dict
-from collections import defaultdict
+from utils.phonemize_text import phonemize_with_dict, phonemize_reference, FRONTEND_VERSION
+from utils.core_utils import iter_text_by_budget
+from .async_api import AsyncInferenceMixin
+from collections import defaultdict, OrderedDict
 from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+from array import array
+import threading
+import hashlib
+import copy
+import time
 import re
 import gc
 
@@ -31,8 +41,7 @@ def _linear_overlap_add(frames: list[np.ndarray], stride: int) -> np.ndarray:
     offset: int = 0
     for frame in frames:
         frame_length = frame.shape[-1]
-        t = np.linspace(0, 1, frame_length + 2, dtype=dtype)[1:-1]
-        weight = np.abs(0.5 - (t - 0.5))
+        weight = _overlap_add_weight(frame_length, dtype)
 
         out[..., offset : offset + frame_length] += weight * frame
         sum_weight[offset : offset + frame_length] += weight
@@ -41,6 +50,793 @@ def _linear_overlap_add(frames: list[np.ndarray], stride: int) -> np.ndarray:
     return out / sum_weight
 
 
+def _overlap_add_weight(frame_length: int, dtype) -> np.ndarray:
+    """Triangular window used by the linear overlap-add"""
+    t = np.linspace(0, 1, frame_length + 2, dtype=dtype)[1:-1]
+    return np.abs(0.5 - (t - 0.5))
+
+
+class StreamingOverlapAdd:
+    """
+    Incremental equivalent of `_linear_overlap_add` for streaming.
+
+    Only the tail of the previous frame that overlaps the next one is kept,
+    so every pushed frame costs O(frame length) regardless of how much audio
+    has already been emitted. The emitted samples are identical to slicing
+    `_linear_overlap_add(all_frames, stride)` after each frame.
+    """
+
+    def __init__(self, stride: int):
+        self.stride = stride
+        self._weights: dict = {}
+        self._pending: np.ndarray | None = None
+        self._pending_weight: np.ndarray | None = None
+
+    def _weight(self, frame_length: int, dtype) -> np.ndarray:
+        key = (frame_length, np.dtype(dtype))
+        if key not in self._weights:
+            self._weights[key] = _overlap_add_weight(frame_length, dtype)
+        return self._weights[key]
+
+    def _accumulate(self, frame: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        weight = self._weight(frame.shape[-1], frame.dtype)
+        out = weight * frame
+        sum_weight = weight.copy()
+
+        if self._pending is not None:
+            n_pending = self._pending.shape[-1]
+            if n_pending > out.shape[-1]:
+                pad = n_pending - out.shape[-1]
+                out = np.concatenate(
+                    [out, np.zeros((*out.shape[:-1], pad), dtype=out.dtype)], axis=-1
+                )
+                sum_weight = np.concatenate([sum_weight, np.zeros(pad, dtype=sum_weight.dtype)])
+            out[..., :n_pending] += self._pending
+            sum_weight[:n_pending] += self._pending_weight
+        return out, sum_weight
+
+    def push(self, frame: np.ndarray, stride: int | None = None) -> np.ndarray:
+        """
+        Add the next frame and return the samples that are now final.
+
+        `stride` is the offset of the following frame relative to this one and
+        defaults to the constant stride, so chunks may grow during a stream.
+        """
+        stride = self.stride if stride is None else stride
+        out, sum_weight = self._accumulate(frame)
+        assert out.shape[-1] >= stride
+        self._pending = out[..., stride:]
+        self._pending_weight = sum_weight[stride:]
+        return out[..., :stride] / sum_weight[:stride]
+
+    def flush(self, frame: np.ndarray | None = None) -> np.ndarray:
+        """Add an optional last frame of any length and return all remaining samples."""
+        if frame is not None:
+            out, sum_weight = self._accumulate(frame)
+        elif self._pending is not None:
+            out, sum_weight = self._pending, self._pending_weight
+        else:
+            return np.zeros(0, dtype=np.float32)
+        self._pending = None
+        self._pending_weight = None
+        assert sum_weight.min() > 0
+        return out / sum_weight
+
+
+_SPEECH_TOKEN_RE = re.compile(r"<\|speech_(\d+)\|>")
+
+
+def _build_speech_token_table(tokenizer) -> np.ndarray:
+    """Map vocabulary ID -> codec code, -1 for non-speech tokens"""
+    vocab = tokenizer.get_vocab()
+    table = np.full(max(vocab.values()) + 1, -1, dtype=np.int32)
+    for token, token_id in vocab.items():
+        match = _SPEECH_TOKEN_RE.fullmatch(token)
+        if match:
+            table[token_id] = int(match.group(1))
+    return table
+
+
+def _speech_ids_from_token_ids(table: np.ndarray, token_ids) -> np.ndarray:
+    """Look up codec codes for generated token IDs, dropping non-speech tokens"""
+    token_ids = np.asarray(token_ids, dtype=np.int64)
+    codes = table[token_ids[token_ids < len(table)]]
+    return codes[codes >= 0]
+
+
+def _codes_key(ref_codes) -> str:
+    """Stable hash of reference codes, used to key per-voice caches"""
+    if isinstance(ref_codes, torch.Tensor):
+        ref_codes = ref_codes.detach().cpu().numpy()
+    return hashlib.sha1(np.asarray(ref_codes, dtype=np.int64).tobytes()).hexdigest()
+
+
+def _flat_codes(ref_codes) -> list[int]:
+    """Reference codes as a flat list of ints"""
+    if isinstance(ref_codes, torch.Tensor):
+        ref_codes = ref_codes.cpu().numpy()
+    if isinstance(ref_codes, np.ndarray):
+        ref_codes = ref_codes.flatten().tolist()
+    return ref_codes
+
+
+def _speech_token_table_from_encode(encode, block: int = 1024) -> np.ndarray:
+    """
+    Map vocabulary ID -> codec code for tokenizers without an enumerable
+    vocabulary (llama.cpp), by tokenizing `<|speech_N|>` until N is unknown.
+    """
+    token_ids, codes = [], []
+    start = 0
+    while True:
+        ids = encode("".join(f"<|speech_{n}|>" for n in range(start, start + block)))
+        if len(ids) == block:
+            token_ids.extend(ids)
+            codes.extend(range(start, start + block))
+            start += block
+            continue
+        # Last block: an unknown code tokenizes into several plain-text tokens
+        for n in range(start, start + block):
+            ids = encode(f"<|speech_{n}|>")
+            if len(ids) != 1:
+                break
+            token_ids.append(ids[0])
+            codes.append(n)
+        break
+
+    if not token_ids:
+        raise ValueError("Tokenizer has no `<|speech_N|>` tokens.")
+    table = np.full(max(token_ids) + 1, -1, dtype=np.int32)
+    table[token_ids] = codes
+    return table
+
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[\.\!\?\…])\s+")
+
+
+class _TextFrontendCache:
+    """
+    LRU of the text frontend output per sentence (normalize -> phonemize ->
+    token IDs), keyed by frontend version and raw sentence text.
+
+    Texts are split into sentences like the chunkers do, so a sentence that
+    recurs in other chunks (disclaimers, IVR prompts, headers) is processed
+    once. Phonemes of a text are the sentence phonemes joined by a space, and
+    its token IDs the concatenated sentence IDs: every sentence is encoded
+    with a leading space, which starts a new pre-tokenizer word.
+    """
+
+    def __init__(self, encode, max_sentences: int = 4096):
+        self.encode = encode
+        self.max_sentences = max_sentences
+        self._sentences: OrderedDict[tuple[int, str], list] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, sentence: str) -> list:
+        key = (FRONTEND_VERSION, sentence)
+        with self._lock:
+            entry = self._sentences.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._sentences.move_to_end(key)
+                return entry
+            self.misses += 1
+
+        # [phonemes, token IDs (encoded on first use)]
+        entry = [phonemize_with_dict(sentence), None]
+        with self._lock:
+            self._sentences[key] = entry
+            while len(self._sentences) > self.max_sentences:
+                self._sentences.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def _split(text: str) -> list[str]:
+        return [sentence for sentence in _SENTENCE_SPLIT_RE.split(text.strip()) if sentence.strip()]
+
+    def phonemize(self, text: str) -> str:
+        return " ".join(self._entry(sentence)[0] for sentence in self._split(text))
+
+    def token_ids(self, text: str) -> list[int]:
+        ids = []
+        for sentence in self._split(text):
+            entry = self._entry(sentence)
+            if entry[1] is None:
+                entry[1] = self.encode(" " + entry[0])
+            ids.extend(entry[1])
+        return ids
+
+    def prepare(self, texts: Iterable[str], token_ids: bool = True) -> int:
+        """Run the frontend for texts ahead of generation, returns the number of new sentences"""
+        misses = self.misses
+        for text in texts:
+            if token_ids:
+                self.token_ids(text)
+            else:
+                self.phonemize(text)
+        return self.misses - misses
+
+    def stats(self) -> dict:
+        return {'sentences': len(self._sentences), 'hits': self.hits, 'misses': self.misses}
+
+
+class _VoicePromptCache(ABC):
+    """
+    LRU of the constant prompt parts of each voice (reference transcript and
+    reference codes), keyed by reference codes hash and transcript.
+    """
+
+    def __init__(self, max_voices: int = 32):
+        self.max_voices = max_voices
+        self._voices: OrderedDict[tuple[str, str], tuple] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def _build_voice(self, ref_codes, ref_text: str) -> tuple:
+        """Prompt parts around the input text for a voice, built on a cache miss"""
+
+    def voice(self, ref_codes, ref_text: str) -> tuple:
+        """Prompt parts around the input text for a voice: (prefix, suffix)"""
+        key = (_codes_key(ref_codes), ref_text)
+        cached = self._voices.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._voices.move_to_end(key)
+            return cached
+
+        self.misses += 1
+        cached = self._build_voice(ref_codes, ref_text)
+        self._voices[key] = cached
+        if len(self._voices) > self.max_voices:
+            self._voices.popitem(last=False)
+        return cached
+
+    def stats(self) -> dict:
+        return {'voices': len(self._voices), 'hits': self.hits, 'misses': self.misses}
+
+
+class _PromptBuilder(_VoicePromptCache):
+    """
+    Pre-tokenized chat prompt for the transformers and GGUF backends.
+
+    The chat template pieces are tokenized once per model, codec codes are
+    mapped to vocabulary IDs through a lookup array, and the token IDs of
+    each voice are cached. Building a prompt then only tokenizes the
+    phonemes of the new text.
+    """
+
+    def __init__(self, encode, speech_token_table: np.ndarray, max_voices: int = 32):
+        """
+        Args:
+            encode: `encode(text, add_special_tokens=False) -> list[int]`, parsing special tokens in `text`
+            speech_token_table: Vocabulary ID -> codec code (see `_build_speech_token_table`)
+            max_voices: Voices kept in the cache
+        """
+        super().__init__(max_voices)
+        self.encode = encode
+        self.speech_token_table = speech_token_table
+        self.frontend = _TextFrontendCache(encode)
+
+        def token_id(token: str) -> int:
+            ids = encode(token)
+            if len(ids) != 1:
+                raise ValueError(f"Tokenizer has no {token} token.")
+            return ids[0]
+
+        # Special tokens split the template, so each piece tokenizes on its own
+        self._head = encode("user: Convert the text to speech:", True) + [token_id("<|TEXT_PROMPT_START|>")]
+        self._middle = (
+            [token_id("<|TEXT_PROMPT_END|>")]
+            + encode("\nassistant:")
+            + [token_id("<|SPEECH_GENERATION_START|>")]
+        )
+        self.speech_end_id = token_id("<|SPEECH_GENERATION_END|>")
+
+        # Codec code -> vocabulary ID
+        speech_token_ids = np.flatnonzero(speech_token_table >= 0)
+        self._code_to_token = np.full(speech_token_table.max() + 1, -1, dtype=np.int64)
+        self._code_to_token[speech_token_table[speech_token_ids]] = speech_token_ids
+
+    @classmethod
+    def from_transformers(cls, tokenizer, speech_token_table: np.ndarray, **kwargs) -> "_PromptBuilder":
+        def encode(text: str, add_special_tokens: bool = False) -> list[int]:
+            return tokenizer.encode(text, add_special_tokens=add_special_tokens)
+        return cls(encode, speech_token_table, **kwargs)
+
+    @classmethod
+    def from_llama(cls, llama, **kwargs) -> "_PromptBuilder":
+        def encode(text: str, add_special_tokens: bool = False) -> list[int]:
+            return llama.tokenize(text.encode("utf-8"), add_bos=add_special_tokens, special=True)
+        return cls(encode, _speech_token_table_from_encode(encode), **kwargs)
+
+    def _code_token_ids(self, ref_codes) -> list[int]:
+        if isinstance(ref_codes, torch.Tensor):
+            ref_codes = ref_codes.detach().cpu().numpy()
+        token_ids = self._code_to_token[np.asarray(ref_codes, dtype=np.int64).ravel()]
+        if (token_ids < 0).any():
+            raise ValueError("Reference codes contain values without a `<|speech_N|>` token.")
+        return token_ids.tolist()
+
+    def _build_voice(self, ref_codes, ref_text: str) -> tuple[list[int], list[int]]:
+        ref_ids = self.encode(phonemize_reference(ref_text))
+        return self._head + ref_ids, self._middle + self._code_token_ids(ref_codes)
+
+    def build(self, ref_codes, ref_text: str, input_text: str) -> list[int]:
+        """Prompt token IDs for synthesizing `input_text` with the given voice"""
+        return self.build_with_prefix(ref_codes, ref_text, input_text)[0]
+
+    def build_with_prefix(self, ref_codes, ref_text: str, input_text: str) -> tuple[list[int], list[int]]:
+        """Prompt token IDs and their voice prefix (shared by every input of the voice), with one cache lookup"""
+        prefix, suffix = self.voice(ref_codes, ref_text)
+        # The leading space starts a new pre-tokenizer word, so encoding the
+        # input on its own gives the same IDs as encoding "<ref> <input>"
+        return prefix + self.frontend.token_ids(input_text) + suffix, prefix
+
+    def voice_tokens(self, ref_codes, ref_text: str) -> int:
+        """Prompt tokens taken by a voice, i.e. everything but the input text"""
+        prefix, suffix = self.voice(ref_codes, ref_text)
+        return len(prefix) + len(suffix)
+
+
+class _TextPromptBuilder(_VoicePromptCache):
+    """
+    Prompt string for LMDeploy, which tokenizes prompts itself.
+
+    The reference transcript phonemes and the `<|speech_N|>` string of the
+    reference codes are built once per voice.
+    """
+
+    def __init__(self, encode, max_voices: int = 32):
+        """
+        Args:
+            encode: `encode(text) -> list[int]` of the LMDeploy model's tokenizer, used for token budgets only
+            max_voices: Voices kept in the cache
+        """
+        super().__init__(max_voices)
+        self.encode = encode
+        self.frontend = _TextFrontendCache(encode)
+
+    def voice_tokens(self, ref_codes, ref_text: str) -> int:
+        """Prompt tokens taken by a voice, i.e. everything but the input text"""
+        prefix, suffix = self.voice(ref_codes, ref_text)
+        return len(self.encode(prefix + suffix))
+
+    def _build_voice(self, ref_codes, ref_text: str) -> tuple[str, str]:
+        if isinstance(ref_codes, torch.Tensor):
+            ref_codes = ref_codes.detach().cpu().numpy()
+        codes_str = "".join([f"<|speech_{idx}|>" for idx in np.asarray(ref_codes).ravel()])
+        return (
+            f"user: Convert the text to speech:<|TEXT_PROMPT_START|>{phonemize_reference(ref_text)} ",
+            f"<|TEXT_PROMPT_END|>\nassistant:<|SPEECH_GENERATION_START|>{codes_str}",
+        )
+
+    def build(self, ref_codes, ref_text: str, input_text: str) -> str:
+        """Prompt string for synthesizing `input_text` with the given voice"""
+        prefix, suffix = self.voice(ref_codes, ref_text)
+        return prefix + self.frontend.phonemize(input_text) + suffix
+
+
+class _LlamaPrefixStateCache:
+    """
+    LRU of llama.cpp context snapshots taken right after the voice prefix of
+    the prompt (chat head + reference transcript), keyed by the prefix token
+    IDs and capped by memory: a snapshot holds the KV state plus the logits
+    of every prefix token. Restoring a snapshot leaves only the new text and
+    the reference codes to evaluate, since `Llama.generate` reuses the
+    matching prefix.
+    """
+
+    def __init__(self, llama, max_bytes: int = 512 * 1024 * 1024):
+        self.llama = llama
+        self.max_bytes = max_bytes
+        self._states: OrderedDict[str, tuple] = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.prefill_saved = 0.0
+
+    def prepare(self, prefix_ids: list[int]) -> None:
+        """Put the context right after `prefix_ids`, evaluating it only on a miss"""
+        # Consecutive chunks of one voice already have the prefix in context,
+        # which llama.cpp reuses without any snapshot
+        n_prefix = len(prefix_ids)
+        if self.llama.n_tokens >= n_prefix and self.llama.input_ids[:n_prefix].tolist() == prefix_ids:
+            return
+
+        key = hashlib.sha1(np.asarray(prefix_ids, dtype=np.int64).tobytes()).hexdigest()
+        cached = self._states.get(key)
+        if cached is not None:
+            state, _, prefill_time = cached
+            self.hits += 1
+            self.prefill_saved += prefill_time
+            self._states.move_to_end(key)
+            self.llama.load_state(state)
+            return
+
+        self.misses += 1
+        start = time.perf_counter()
+        self.llama.reset()
+        self.llama.eval(prefix_ids)
+        prefill_time = time.perf_counter() - start
+
+        state = self.llama.save_state()
+        nbytes = len(state.llama_state) + state.scores.nbytes + state.input_ids.nbytes
+        if nbytes <= self.max_bytes:
+            self._states[key] = (state, nbytes, prefill_time)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted, _) = self._states.popitem(last=False)
+                self.nbytes -= evicted
+
+    def stats(self) -> dict:
+        return {
+            'voices': len(self._states),
+            'mbytes': round(self.nbytes / 2**20, 1),
+            'hits': self.hits,
+            'misses': self.misses,
+            'prefill_saved_s': round(self.prefill_saved, 3),
+        }
+
+
+def _kv_cache_nbytes(cache) -> int:
+    """Memory held by the key/value tensors of a transformers cache"""
+    if hasattr(cache, "layers"):
+        tensors = [t for layer in cache.layers for t in (layer.keys, layer.values)]
+    else:
+        tensors = [t for layer in cache for t in layer]
+    return sum(t.numel() * t.element_size() for t in tensors if t is not None)
+
+
+class _PrefixKVCache:
+    """
+    LRU of transformers `past_key_values` for the voice prefix of the prompt
+    (chat head + reference transcript), keyed by the prefix token IDs and
+    capped by memory. `generate` extends a copy, so only the new text and
+    the reference codes are prefilled per request.
+    """
+
+    def __init__(self, model, max_bytes: int = 512 * 1024 * 1024):
+        self.model = model
+        self.max_bytes = max_bytes
+        self._caches: OrderedDict[str, tuple] = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.prefill_saved = 0.0
+
+    def get(self, prefix_ids: list[int]):
+        """A copy of the prefix cache, safe to extend during generation"""
+        key = hashlib.sha1(np.asarray(prefix_ids, dtype=np.int64).tobytes()).hexdigest()
+        cached = self._caches.get(key)
+        if cached is not None:
+            cache, _, prefill_time = cached
+            self.hits += 1
+            self.prefill_saved += prefill_time
+            self._caches.move_to_end(key)
+            return copy.deepcopy(cache)
+
+        self.misses += 1
+        start = time.perf_counter()
+        prefix_tensor = torch.tensor(prefix_ids).unsqueeze(0).to(self.model.device)
+        with torch.no_grad():
+            cache = self.model(prefix_tensor, use_cache=True).past_key_values
+        prefill_time = time.perf_counter() - start
+
+        nbytes = _kv_cache_nbytes(cache)
+        if nbytes <= self.max_bytes:
+            self._caches[key] = (cache, nbytes, prefill_time)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted, _) = self._caches.popitem(last=False)
+                self.nbytes -= evicted
+        return copy.deepcopy(cache) if key in self._caches else cache
+
+    def stats(self) -> dict:
+        return {
+            'voices': len(self._caches),
+            'mbytes': round(self.nbytes / 2**20, 1),
+            'hits': self.hits,
+            'misses': self.misses,
+            'prefill_saved_s': round(self.prefill_saved, 3),
+        }
+
+
+def _iter_text_for_context(
+    builder, max_context: int, text: str, ref_codes, ref_text: str, speech_margin: float = 1.3
+) -> Iterator[str]:
+    """
+    Split text into chunks that fit the context window together with the voice
+    prompt and the speech tokens they will generate, one chunk at a time.
+
+    Speech tokens are estimated from the voice's own speaking rate, i.e. the
+    reference codes per reference transcript token, times `speech_margin`.
+    """
+    ref_text_tokens = max(1, len(builder.encode(phonemize_reference(ref_text))))
+    n_ref_codes = ref_codes.numel() if isinstance(ref_codes, torch.Tensor) else np.asarray(ref_codes).size
+    speech_per_token = n_ref_codes / ref_text_tokens * speech_margin
+    # One token for the end of speech
+    budget = max_context - builder.voice_tokens(ref_codes, ref_text) - 1
+
+    def cost(sentence: str) -> float:
+        return len(builder.frontend.token_ids(sentence)) * (1 + speech_per_token)
+
+    def word_cost(word: str) -> float:
+        # Words of an oversized sentence bypass the sentence cache, which they would flush
+        return len(builder.encode(" " + phonemize_with_dict(word))) * (1 + speech_per_token)
+
+    if budget <= 0:
+        raise ValueError(f"The reference voice alone fills the {max_context}-token context.")
+    return iter_text_by_budget(text, cost, budget, word_cost)
+
+
+def _chunk_schedule(first_chunk_frames: int, growth: float, max_chunk_frames: int) -> Iterator[int]:
+    """Frames per streamed chunk: a small first chunk growing geometrically up to a cap"""
+    frames = float(max(1, min(first_chunk_frames, max_chunk_frames)))
+    while True:
+        yield int(frames)
+        frames = min(frames * max(growth, 1.0), max_chunk_frames)
+
+
+@dataclass
+class StreamMetrics:
+    """Latency metrics collected for one `infer_stream` call"""
+    start_time: float = field(default_factory=time.perf_counter)
+    time_to_first_token: float | None = None
+    time_to_first_audio: float | None = None
+    total_time: float | None = None
+    n_tokens: int = 0
+    n_chunks: int = 0
+    audio_samples: int = 0
+    sample_rate: int = 24_000
+    codec_stats: dict = field(default_factory=dict)
+
+    @property
+    def audio_seconds(self) -> float:
+        return self.audio_samples / self.sample_rate
+
+    def on_token(self):
+        if self.time_to_first_token is None:
+            self.time_to_first_token = time.perf_counter() - self.start_time
+        self.n_tokens += 1
+
+    def on_chunk(self, chunk: np.ndarray):
+        if self.time_to_first_audio is None:
+            self.time_to_first_audio = time.perf_counter() - self.start_time
+        self.n_chunks += 1
+        self.audio_samples += chunk.shape[-1]
+
+    def finish(self):
+        self.total_time = time.perf_counter() - self.start_time
+
+    def to_dict(self) -> dict:
+        return {
+            "time_to_first_token": self.time_to_first_token,
+            "time_to_first_audio": self.time_to_first_audio,
+            "total_time": self.total_time,
+            "n_tokens": self.n_tokens,
+            "n_chunks": self.n_chunks,
+            "audio_seconds": self.audio_seconds,
+            "codec": self.codec_stats,
+        }
+
+
+# Left context (codec frames) decoded again with every streamed chunk. 50
+# frames reproduces the original streaming output exactly, at ~3.3 decoded
+# frames per emitted frame with 25-frame chunks. A shorter context decodes
+# less but changes the audio: lower it (or `streaming_lookback` per engine)
+# only once benchmarks/bench_streaming_decoder.py shows its SNR against the
+# 50-frame output stays above --min-snr.
+STREAMING_DECODE_CONTEXT_FRAMES = 50
+
+
+class StreamingCodecDecoder:
+    """
+    Windowed codec decoding for streaming with a bounded code buffer.
+
+    NeuCodec decoders are non-causal and expose no recurrent state, so every
+    chunk is decoded together with `context_frames` of already-emitted codes
+    as left context plus `lookforward_frames` of right context. The work per
+    emitted frame is set by that context, so `context_frames` trades
+    accuracy for fewer decoded frames (see STREAMING_DECODE_CONTEXT_FRAMES).
+    Codes older than the context are dropped.
+    """
+
+    def __init__(
+        self,
+        decode_codes,
+        hop_length: int,
+        context_frames: int,
+        lookforward_frames: int,
+        overlap_frames: int,
+        ref_codes: Iterable[int] = (),
+    ):
+        self.decode_codes = decode_codes
+        self.hop_length = hop_length
+        self.context_frames = context_frames
+        self.lookforward_frames = lookforward_frames
+        self.overlap_frames = overlap_frames
+
+        self._codes = array("i", (int(code) for code in ref_codes))
+        self._n_decoded = len(self._codes)
+        self._trim()
+
+        # Stats
+        self.decoded_frames = 0
+        self.emitted_frames = 0
+        self.decode_time = 0.0
+
+    @property
+    def n_pending(self) -> int:
+        """Codes received but not yet emitted as audio"""
+        return len(self._codes) - self._n_decoded
+
+    def append(self, code: int):
+        self._codes.append(code)
+
+    def _trim(self):
+        # Codes before the left context are never decoded again
+        keep_from = self._n_decoded - self.context_frames - self.overlap_frames
+        if keep_from > 0:
+            del self._codes[:keep_from]
+            self._n_decoded -= keep_from
+
+    def _decode_window(self, start: int, end: int | None) -> np.ndarray:
+        window = self._codes[start:end]
+        t0 = time.perf_counter()
+        recon = self.decode_codes(window)
+        self.decode_time += time.perf_counter() - t0
+        self.decoded_frames += len(window)
+        return recon
+
+    def decode_chunk(self, frames: int) -> np.ndarray:
+        """Decode the next `frames` frames, with overlap on both sides."""
+        start = max(self._n_decoded - self.context_frames - self.overlap_frames, 0)
+        end = self._n_decoded + frames + self.lookforward_frames + self.overlap_frames
+        sample_start = (self._n_decoded - start) * self.hop_length
+        sample_end = sample_start + (frames + 2 * self.overlap_frames) * self.hop_length
+
+        recon = self._decode_window(start, end)[sample_start:sample_end]
+        self._n_decoded += frames
+        self.emitted_frames += frames
+        self._trim()
+        return recon
+
+    def decode_final(self) -> np.ndarray:
+        """Decode all remaining codes, with overlap on the left side."""
+        remaining = self.n_pending
+        start = max(self._n_decoded - self.context_frames - self.overlap_frames, 0)
+        sample_start = (self._n_decoded - start - self.overlap_frames) * self.hop_length
+
+        recon = self._decode_window(start, None)[sample_start:]
+        self._n_decoded += remaining
+        self.emitted_frames += remaining
+        self._trim()
+        return recon
+
+    def stats(self) -> dict:
+        return {
+            "decoded_frames": self.decoded_frames,
+            "emitted_frames": self.emitted_frames,
+            "decoded_per_emitted": self.decoded_frames / max(self.emitted_frames, 1),
+            "decode_time": self.decode_time,
+        }
+
+
+def _stream_decode(tts, ref_codes, codes: Iterable[int], metrics: StreamMetrics | None = None) -> Generator[np.ndarray, None, None]:
+    """
+    Chunked codec decode with overlap-add over a stream of speech codes.
+
+    Shared by every streaming backend. `tts` provides the codec
+    (`_decode_codes`) and the `hop_length` / `streaming_*` constants,
+    `codes` yields one integer codec code per generated speech token.
+    Chunk sizes follow `_chunk_schedule`, starting at
+    `streaming_first_chunk_frames` and growing up to
+    `streaming_frames_per_chunk`. `streaming_lookback` is the left context
+    decoded with every chunk.
+    """
+    metrics = metrics if metrics is not None else StreamMetrics()
+    metrics.sample_rate = tts.sample_rate
+    schedule = _chunk_schedule(
+        tts.streaming_first_chunk_frames,
+        tts.streaming_chunk_growth,
+        tts.streaming_frames_per_chunk,
+    )
+    frames_per_chunk = next(schedule)
+    overlap_add = StreamingOverlapAdd(stride=tts.streaming_stride_samples)
+    decoder = StreamingCodecDecoder(
+        tts._decode_codes,
+        hop_length=tts.hop_length,
+        context_frames=tts.streaming_lookback,
+        lookforward_frames=tts.streaming_lookforward,
+        overlap_frames=tts.streaming_overlap_frames,
+        ref_codes=ref_codes,
+    )
+
+    for code in codes:
+        decoder.append(code)
+        metrics.on_token()
+
+        if decoder.n_pending >= frames_per_chunk + tts.streaming_lookforward:
+            recon = decoder.decode_chunk(frames_per_chunk)
+
+            # postprocess
+            processed_recon = overlap_add.push(recon, stride=frames_per_chunk * tts.hop_length)
+            frames_per_chunk = next(schedule)
+            metrics.on_chunk(processed_recon)
+            yield processed_recon
+
+    # final decoding handled separately as non-constant chunk size
+    if decoder.n_pending > 0:
+        recon = decoder.decode_final()
+
+        processed_recon = overlap_add.flush(recon)
+        metrics.on_chunk(processed_recon)
+        yield processed_recon
+
+    metrics.codec_stats = decoder.stats()
+    metrics.finish()
+
+
+class _TokenIdStreamer:
+    """
+    Streamer for `transformers` `generate` that hands sampled token IDs to
+    another thread. Setting `cancelled` stops generation at the next step
+    when used as a stopping criterion.
+    """
+
+    def __init__(self):
+        self.queue: Queue = Queue()
+        self.cancelled = False
+        self.error: Exception | None = None
+        self._prompt_skipped = False
+
+    def put(self, value: torch.Tensor):
+        # The first call receives the prompt
+        if not self._prompt_skipped:
+            self._prompt_skipped = True
+            return
+        for token_id in value.reshape(-1).tolist():
+            self.queue.put(token_id)
+
+    def end(self):
+        self.queue.put(None)
+
+    def __call__(self, input_ids: torch.Tensor, scores: torch.Tensor, **kwargs) -> torch.Tensor:
+        return torch.full((input_ids.shape[0],), self.cancelled, dtype=torch.bool, device=input_ids.device)
+
+    def __iter__(self):
+        while (token_id := self.queue.get()) is not None:
+            yield token_id
+
+
+class _RowTokenLimit:
+    """
+    Stopping criterion for a left-padded `generate` batch that ends each row
+    once it holds `max_length` tokens of its own, as if it ran alone.
+    """
+
+    def __init__(self, prompt_lengths: list[int], width: int, max_length: int):
+        self.width = width
+        self.max_new_tokens = torch.tensor([max_length - length for length in prompt_lengths])
+
+    def __call__(self, input_ids: torch.Tensor, scores: torch.Tensor, **kwargs) -> torch.Tensor:
+        n_new = input_ids.shape[1] - self.width
+        return (n_new >= self.max_new_tokens).to(input_ids.device)
+
+
+def _left_pad(prompts: list[list[int]], pad_id: int) -> tuple[torch.Tensor, torch.Tensor]:
+    """Left-padded input IDs and attention mask for a batch of prompts"""
+    width = max(map(len, prompts))
+    input_ids = torch.full((len(prompts), width), pad_id, dtype=torch.long)
+    attention_mask = torch.zeros((len(prompts), width), dtype=torch.long)
+    for row, prompt_ids in enumerate(prompts):
+        input_ids[row, width - len(prompt_ids):] = torch.tensor(prompt_ids)
+        attention_mask[row, width - len(prompt_ids):] = 1
+    return input_ids, attention_mask
+
+
 def _compile_codec_with_triton(codec):
     """Compile codec with Triton for faster decoding (Windows/Linux compatible)"""
     try:
@@ -69,13 +865,16 @@ def _compile_codec_with_triton(codec):
 # Supports: PyTorch Transformers, GGUF/GGML quantized models
 # ============================================================================
 
-class VieNeuTTS:
+class VieNeuTTS(AsyncInferenceMixin):
     """
     Standard VieNeu-TTS implementation.
     
     Supports:
     - PyTorch + Transformers backend (CPU/GPU)
     - GGUF quantized models via llama-cpp-python (CPU optimized)
+    - Batched generation of several chunks (`infer_batch`, transformers only)
+    - asyncio: `ainfer` / `ainfer_stream` / `ainfer_batch` (one worker thread,
+      the backbone is not safe for concurrent generation)
     
     Use this for:
     - CPU-only environments
@@ -107,8 +906,17 @@ class VieNeuTTS:
         self.streaming_overlap_frames = 1
         self.streaming_frames_per_chunk = 25
         self.streaming_lookforward = 5
-        self.streaming_lookback = 50
+        self.streaming_lookback = STREAMING_DECODE_CONTEXT_FRAMES
         self.streaming_stride_samples = self.streaming_frames_per_chunk * self.hop_length
+        # Chunk schedule: small first chunk for low time-to-first-audio, then
+        # geometric growth up to streaming_frames_per_chunk
+        self.streaming_first_chunk_frames = 10
+        self.streaming_chunk_growth = 2.0
+        # Chunks generated together by infer_batch (transformers backend)
+        self.max_batch_size = 4
+
+        # Metrics of the most recent infer_stream call
+        self.last_stream_metrics: StreamMetrics | None = None
 
         # Flags
         self._is_quantized_model = False
@@ -117,6 +925,11 @@ class VieNeuTTS:
         # HF tokenizer
         self.tokenizer = None
 
+        # llama.cpp context snapshots after each voice prefix (GGUF only)
+        self._prefix_state_cache: _LlamaPrefixStateCache | None = None
+        # past_key_values of each voice prefix (transformers only)
+        self._prefix_kv_cache: _PrefixKVCache | None = None
+
         # Load models
         self._load_backbone(backbone_repo, backbone_device)
         self._load_codec(codec_repo, codec_device)
@@ -142,13 +955,19 @@ class VieNeuTTS:
                 flash_attn=True if backbone_device == "gpu" else False,
             )
             self._is_quantized_model = True
+            self._prompt_builder = _PromptBuilder.from_llama(self.backbone)
+            self._speech_token_table = self._prompt_builder.speech_token_table
+            self._prefix_state_cache = _LlamaPrefixStateCache(self.backbone)
             
         else:
             from transformers import AutoTokenizer, AutoModelForCausalLM
             self.tokenizer = AutoTokenizer.from_pretrained(backbone_repo)
+            self._speech_token_table = _build_speech_token_table(self.tokenizer)
+            self._prompt_builder = _PromptBuilder.from_transformers(self.tokenizer, self._speech_token_table)
             self.backbone = AutoModelForCausalLM.from_pretrained(backbone_repo).to(
                 torch.device(backbone_device)
             )
+            self._prefix_kv_cache = _PrefixKVCache(self.backbone)
     
     def _load_codec(self, codec_repo, codec_device):
         print(f"Loading codec from: {codec_repo} on {codec_device} ...")
@@ -182,6 +1001,24 @@ class VieNeuTTS:
             ref_codes = self.codec.encode_code(audio_or_path=wav_tensor).squeeze(0).squeeze(0)
         return ref_codes
 
+    def split_text(self, text: str, ref_codes: np.ndarray | torch.Tensor, ref_text: str) -> list[str]:
+        """
+        Split a document into the fewest chunks that fit the context window with
+        this voice: prompt, reference codes and the expected speech tokens.
+        """
+        return list(self.iter_split_text(text, ref_codes, ref_text))
+
+    def iter_split_text(self, text: str, ref_codes: np.ndarray | torch.Tensor, ref_text: str) -> Iterator[str]:
+        """`split_text` one chunk at a time, running the text frontend only up to that chunk."""
+        return _iter_text_for_context(self._prompt_builder, self.max_context, text, ref_codes, ref_text)
+
+    def prepare_texts(self, texts: Iterable[str]) -> int:
+        """
+        Normalize, phonemize and tokenize texts ahead of generation, filling the
+        sentence-level frontend cache. Returns the number of new sentences.
+        """
+        return self._prompt_builder.frontend.prepare(texts)
+
     def infer(self, text: str, ref_codes: np.ndarray | torch.Tensor, ref_text: str) -> np.ndarray:
         """
         Perform inference to generate speech from text using the TTS model and reference audio.
@@ -195,18 +1032,80 @@ class VieNeuTTS:
         """
 
         # Generate tokens
+        prompt_ids, prefix_ids = self._prompt_builder.build_with_prefix(ref_codes, ref_text, text)
         if self._is_quantized_model:
-            output_str = self._infer_ggml(ref_codes, ref_text, text)
+            output_ids = self._infer_ggml(prompt_ids, prefix_ids)
         else:
-            prompt_ids = self._apply_chat_template(ref_codes, ref_text, text)
-            output_str = self._infer_torch(prompt_ids)
+            output_ids = self._infer_torch(prompt_ids, prefix_ids)
 
         # Decode
-        wav = self._decode(output_str)
+        wav = self._decode(output_ids)
 
         return wav
 
-    def infer_stream(self, text: str, ref_codes: np.ndarray | torch.Tensor, ref_text: str) -> Generator[np.ndarray, None, None]:
+    def infer_batch(
+        self,
+        texts: list[str],
+        ref_codes: np.ndarray | torch.Tensor | list,
+        ref_text: str | list[str],
+        max_batch_size: int | None = None,
+    ) -> list[np.ndarray]:
+        """
+        Generate several chunks together: the prompts are left-padded and
+        sampled in one `generate` call per `max_batch_size` chunks of the
+        same voice, each stopping at its own end of speech or when it fills
+        `max_context` on its own. GGUF models generate the chunks one at a
+        time.
+
+        Args:
+            texts (list[str]): Input texts to be converted to speech.
+            ref_codes (np.ndarray | torch.tensor | list): Encoded reference, or one per text.
+            ref_text (str | list[str]): Reference text for reference audio, or one per text.
+            max_batch_size (int, optional): Chunks per `generate` call, `self.max_batch_size` by default.
+        Returns:
+            list[np.ndarray]: Generated speech waveform of each text.
+        """
+        if max_batch_size is None:
+            max_batch_size = self.max_batch_size
+
+        if not isinstance(texts, list):
+            texts = [texts]
+
+        if isinstance(ref_text, str):
+            refs = [(ref_codes, ref_text)] * len(texts)
+        else:
+            refs = list(zip(ref_codes, ref_text))
+            if len(refs) != len(texts):
+                raise ValueError("ref_codes and ref_text need one entry per text")
+
+        if self._is_quantized_model:
+            return [self.infer(text, codes, voice_text) for text, (codes, voice_text) in zip(texts, refs)]
+
+        prompts = [self._apply_chat_template(codes, voice_text, text) for text, (codes, voice_text) in zip(texts, refs)]
+
+        # Only chunks of one voice (prompts differing by their text) are
+        # batched together, sorted by length to keep padding small
+        voices = defaultdict(list)
+        for i, (codes, voice_text) in enumerate(refs):
+            voices[(_codes_key(codes), voice_text)].append(i)
+
+        wavs = [None] * len(prompts)
+        for indices in voices.values():
+            indices.sort(key=lambda i: len(prompts[i]))
+            for start in range(0, len(indices), max_batch_size):
+                batch = indices[start:start + max_batch_size]
+                outputs = self._infer_torch_batch([prompts[i] for i in batch])
+                for i, output_ids in zip(batch, outputs):
+                    wavs[i] = self._decode(output_ids)
+        return wavs
+
+    def infer_stream(
+        self,
+        text: str,
+        ref_codes: np.ndarray | torch.Tensor,
+        ref_text: str,
+        metrics: StreamMetrics | None = None,
+    ) -> Generator[np.ndarray, None, None]:
         """
         Perform streaming inference to generate speech from text using the TTS model and reference audio.
 
@@ -214,20 +1113,27 @@ class VieNeuTTS:
             text (str): Input text to be converted to speech.
             ref_codes (np.ndarray | torch.tensor): Encoded reference.
             ref_text (str): Reference text for reference audio.
+            metrics (StreamMetrics, optional): Filled with latency metrics while streaming.
+                The metrics of the latest stream are also kept in `last_stream_metrics`.
         Yields:
             np.ndarray: Generated speech waveform.
         """
+        metrics = metrics if metrics is not None else StreamMetrics()
+        self.last_stream_metrics = metrics
 
+        prompt_ids, prefix_ids = self._prompt_builder.build_with_prefix(ref_codes, ref_text, text)
         if self._is_quantized_model:
-            return self._infer_stream_ggml(ref_codes, ref_text, text)
+            codes = self._infer_stream_ggml(prompt_ids, prefix_ids)
         else:
-            raise NotImplementedError("Streaming is not implemented for the torch backend!")
+            codes = self._infer_stream_torch(prompt_ids, prefix_ids)
+        return _stream_decode(self, ref_codes, codes, metrics)
 
-    def _decode(self, codes: str):
-        """Decode speech tokens to audio waveform."""
-        # Extract speech token IDs using regex
-        speech_ids = [int(num) for num in re.findall(r"<\|speech_(\d+)\|>", codes)]
-        
+    def _decode(self, token_ids) -> np.ndarray:
+        """Decode generated speech token IDs to audio waveform."""
+        return self._decode_codes(_speech_ids_from_token_ids(self._speech_token_table, token_ids))
+
+    def _decode_codes(self, speech_ids) -> np.ndarray:
+        """Decode integer codec codes to audio waveform."""
         if len(speech_ids) == 0:
             raise ValueError(
                 "No valid speech tokens found in the output. "
@@ -236,53 +1142,38 @@ class VieNeuTTS:
         
         # Onnx decode
         if self._is_onnx_codec:
-            codes = np.array(speech_ids, dtype=np.int32)[np.newaxis, np.newaxis, :]
+            codes = np.asarray(speech_ids, dtype=np.int32)[np.newaxis, np.newaxis, :]
             recon = self.codec.decode_code(codes)
         # Torch decode
         else:
             with torch.no_grad():
-                codes = torch.tensor(speech_ids, dtype=torch.long)[None, None, :].to(
+                codes = torch.as_tensor(np.asarray(speech_ids), dtype=torch.long)[None, None, :].to(
                     self.codec.device
                 )
                 recon = self.codec.decode_code(codes).cpu().numpy()
         
         return recon[0, 0, :]
     
-    def _apply_chat_template(self, ref_codes: list[int], ref_text: str, input_text: str) -> list[int]:
-        input_text = phonemize_with_dict(ref_text) + " " + phonemize_with_dict(input_text)
-
-        speech_replace = self.tokenizer.convert_tokens_to_ids("<|SPEECH_REPLACE|>")
-        speech_gen_start = self.tokenizer.convert_tokens_to_ids("<|SPEECH_GENERATION_START|>")
-        text_replace = self.tokenizer.convert_tokens_to_ids("<|TEXT_REPLACE|>")
-        text_prompt_start = self.tokenizer.convert_tokens_to_ids("<|TEXT_PROMPT_START|>")
-        text_prompt_end = self.tokenizer.convert_tokens_to_ids("<|TEXT_PROMPT_END|>")
-
-        input_ids = self.tokenizer.encode(input_text, add_special_tokens=False)
-        chat = """user: Convert the text to speech:<|TEXT_REPLACE|>\nassistant:<|SPEECH_REPLACE|>"""
-        ids = self.tokenizer.encode(chat)
-
-        text_replace_idx = ids.index(text_replace)
-        ids = (
-            ids[:text_replace_idx]
-            + [text_prompt_start]
-            + input_ids
-            + [text_prompt_end]
-            + ids[text_replace_idx + 1 :]  # noqa
-        )
-
-        speech_replace_idx = ids.index(speech_replace)
-        codes_str = "".join([f"<|speech_{i}|>" for i in ref_codes])
-        codes = self.tokenizer.encode(codes_str, add_special_tokens=False)
-        ids = ids[:speech_replace_idx] + [speech_gen_start] + list(codes)
+    def get_cache_stats(self) -> dict:
+        """Hit/miss counts of the prompt, text frontend and prefix caches (with prefill time saved)"""
+        return {
+            'prompt_cache': self._prompt_builder.stats(),
+            'text_frontend': self._prompt_builder.frontend.stats(),
+            'prefix_state_cache': self._prefix_state_cache.stats() if self._prefix_state_cache else None,
+            'prefix_kv_cache': self._prefix_kv_cache.stats() if self._prefix_kv_cache else None,
+        }
 
-        return ids
+    def _apply_chat_template(self, ref_codes: list[int], ref_text: str, input_text: str) -> list[int]:
+        return self._prompt_builder.build(ref_codes, ref_text, input_text)
 
-    def _infer_torch(self, prompt_ids: list[int]) -> str:
+    def _infer_torch(self, prompt_ids: list[int], prefix_ids: list[int]) -> np.ndarray:
         prompt_tensor = torch.tensor(prompt_ids).unsqueeze(0).to(self.backbone.device)
-        speech_end_id = self.tokenizer.convert_tokens_to_ids("<|SPEECH_GENERATION_END|>")
+        speech_end_id = self._prompt_builder.speech_end_id
+        past_key_values = self._prefix_kv_cache.get(prefix_ids)
         with torch.no_grad():
             output_tokens = self.backbone.generate(
                 prompt_tensor,
+                past_key_values=past_key_values,
                 max_length=self.max_context,
                 eos_token_id=speech_end_id,
                 do_sample=True,
@@ -292,117 +1183,105 @@ class VieNeuTTS:
                 min_new_tokens=50,
             )
         input_length = prompt_tensor.shape[-1]
-        output_str = self.tokenizer.decode(
-            output_tokens[0, input_length:].cpu().numpy().tolist(), add_special_tokens=False
-        )
-        return output_str
+        return output_tokens[0, input_length:].cpu().numpy()
 
-    def _infer_ggml(self, ref_codes: list[int], ref_text: str, input_text: str) -> str:
-        ref_text = phonemize_with_dict(ref_text)
-        input_text = phonemize_with_dict(input_text)
+    def _infer_torch_batch(self, prompts: list[list[int]]) -> list[np.ndarray]:
+        """Sample several left-padded prompts at once, returns each one's tokens up to its end of speech."""
+        from transformers import StoppingCriteriaList
 
-        codes_str = "".join([f"<|speech_{idx}|>" for idx in ref_codes])
-        prompt = (
-            f"user: Convert the text to speech:<|TEXT_PROMPT_START|>{ref_text} {input_text}"
-            f"<|TEXT_PROMPT_END|>\nassistant:<|SPEECH_GENERATION_START|>{codes_str}"
-        )
-        output = self.backbone(
-            prompt,
-            max_tokens=self.max_context,
-            temperature=1.0,
-            top_k=50,
-            stop=["<|SPEECH_GENERATION_END|>"],
-        )
-        output_str = output["choices"][0]["text"]
-        return output_str
+        speech_end_id = self._prompt_builder.speech_end_id
+        pad_id = self.tokenizer.pad_token_id if self.tokenizer.pad_token_id is not None else speech_end_id
+        input_ids, attention_mask = _left_pad(prompts, pad_id)
+        width = input_ids.shape[1]
+        # Each row may grow to max_context tokens of its own, as in `_infer_torch`
+        row_limit = _RowTokenLimit([len(prompt_ids) for prompt_ids in prompts], width, self.max_context)
 
-    def _infer_stream_ggml(self, ref_codes: torch.Tensor, ref_text: str, input_text: str) -> Generator[np.ndarray, None, None]:
-        ref_text = phonemize_with_dict(ref_text)
-        input_text = phonemize_with_dict(input_text)
+        # Padded rows do not share the voice prefix positions, so no prefix KV reuse here
+        with torch.no_grad():
+            output_tokens = self.backbone.generate(
+                input_ids.to(self.backbone.device),
+                attention_mask=attention_mask.to(self.backbone.device),
+                max_new_tokens=int(row_limit.max_new_tokens.max()),
+                eos_token_id=speech_end_id,
+                pad_token_id=pad_id,
+                do_sample=True,
+                temperature=1.0,
+                top_k=50,
+                use_cache=True,
+                min_new_tokens=50,
+                stopping_criteria=StoppingCriteriaList([row_limit]),
+            )
 
-        codes_str = "".join([f"<|speech_{idx}|>" for idx in ref_codes])
-        prompt = (
-            f"user: Convert the text to speech:<|TEXT_PROMPT_START|>{ref_text} {input_text}"
-            f"<|TEXT_PROMPT_END|>\nassistant:<|SPEECH_GENERATION_START|>{codes_str}"
-        )
+        outputs = []
+        for row, max_new_tokens in zip(output_tokens[:, width:].cpu().numpy(), row_limit.max_new_tokens.tolist()):
+            # Finished rows are padded until the whole batch is done
+            row = row[:max_new_tokens]
+            end = np.flatnonzero(row == speech_end_id)
+            outputs.append(row[:end[0]] if len(end) else row)
+        return outputs
 
-        audio_cache: list[np.ndarray] = []
-        token_cache: list[str] = [f"<|speech_{idx}|>" for idx in ref_codes]
-        n_decoded_samples: int = 0
-        n_decoded_tokens: int = len(ref_codes)
+    def _infer_stream_torch(self, prompt_ids: list[int], prefix_ids: list[int]) -> Generator[int, None, None]:
+        """Generate on a worker thread and yield each speech code as it is sampled."""
+        from transformers import StoppingCriteriaList
 
-        for item in self.backbone(
-            prompt,
-            max_tokens=self.max_context,
-            temperature=1.0,
-            top_k=50,
-            stop=["<|SPEECH_GENERATION_END|>"],
-            stream=True
-        ):
-            output_str = item["choices"][0]["text"]
-            token_cache.append(output_str)
-
-            if len(token_cache[n_decoded_tokens:]) >= self.streaming_frames_per_chunk + self.streaming_lookforward:
-
-                # decode chunk
-                tokens_start = max(
-                    n_decoded_tokens
-                    - self.streaming_lookback
-                    - self.streaming_overlap_frames,
-                    0
-                )
-                tokens_end = (
-                    n_decoded_tokens
-                    + self.streaming_frames_per_chunk
-                    + self.streaming_lookforward
-                    + self.streaming_overlap_frames
-                )
-                sample_start = (
-                    n_decoded_tokens - tokens_start
-                ) * self.hop_length
-                sample_end = (
-                    sample_start
-                    + (self.streaming_frames_per_chunk + 2 * self.streaming_overlap_frames) * self.hop_length
-                )
-                curr_codes = token_cache[tokens_start:tokens_end]
-                recon = self._decode("".join(curr_codes))
-                recon = recon[sample_start:sample_end]
-                audio_cache.append(recon)
-
-                # postprocess
-                processed_recon = _linear_overlap_add(
-                    audio_cache, stride=self.streaming_stride_samples
-                )
-                new_samples_end = len(audio_cache) * self.streaming_stride_samples
-                processed_recon = processed_recon[
-                    n_decoded_samples:new_samples_end
-                ]
-                n_decoded_samples = new_samples_end
-                n_decoded_tokens += self.streaming_frames_per_chunk
-                yield processed_recon
-
-        # final decoding handled separately as non-constant chunk size
-        remaining_tokens = len(token_cache) - n_decoded_tokens
-        if len(token_cache) > n_decoded_tokens:
-            tokens_start = max(
-                len(token_cache)
-                - (self.streaming_lookback + self.streaming_overlap_frames + remaining_tokens), 
-                0
-            )
-            sample_start = (
-                len(token_cache) 
-                - tokens_start 
-                - remaining_tokens 
-                - self.streaming_overlap_frames
-            ) * self.hop_length
-            curr_codes = token_cache[tokens_start:]
-            recon = self._decode("".join(curr_codes))
-            recon = recon[sample_start:]
-            audio_cache.append(recon)
-
-            processed_recon = _linear_overlap_add(audio_cache, stride=self.streaming_stride_samples)
-            processed_recon = processed_recon[n_decoded_samples:]
-            yield processed_recon
+        prompt_tensor = torch.tensor(prompt_ids).unsqueeze(0).to(self.backbone.device)
+        speech_end_id = self._prompt_builder.speech_end_id
+        past_key_values = self._prefix_kv_cache.get(prefix_ids)
+        streamer = _TokenIdStreamer()
+
+        def generate():
+            try:
+                with torch.no_grad():
+                    self.backbone.generate(
+                        prompt_tensor,
+                        past_key_values=past_key_values,
+                        max_length=self.max_context,
+                        eos_token_id=speech_end_id,
+                        do_sample=True,
+                        temperature=1.0,
+                        top_k=50,
+                        use_cache=True,
+                        min_new_tokens=50,
+                        streamer=streamer,
+                        stopping_criteria=StoppingCriteriaList([streamer]),
+                    )
+            except Exception as e:
+                streamer.error = e
+                streamer.end()
+
+        thread = threading.Thread(target=generate, daemon=True)
+        thread.start()
+        try:
+            for token_id in streamer:
+                if token_id == speech_end_id:
+                    break
+                for code in _speech_ids_from_token_ids(self._speech_token_table, [token_id]):
+                    yield int(code)
+        finally:
+            streamer.cancelled = True
+            thread.join()
+
+        if streamer.error is not None:
+            raise streamer.error
+
+    def _generate_ggml(self, prompt_ids: list[int], prefix_ids: list[int]) -> Generator[int, None, None]:
+        """Sample token IDs with llama.cpp until the end of speech or the context is full."""
+        self._prefix_state_cache.prepare(prefix_ids)
+        stop_ids = (self._prompt_builder.speech_end_id, self.backbone.token_eos())
+        max_tokens = self.max_context - len(prompt_ids)
+        for i, token_id in enumerate(self.backbone.generate(prompt_ids, temp=1.0, top_k=50, top_p=0.95, min_p=0.05)):
+            if token_id in stop_ids or i >= max_tokens:
+                break
+            yield token_id
+
+    def _infer_ggml(self, prompt_ids: list[int], prefix_ids: list[int]) -> list[int]:
+        return list(self._generate_ggml(prompt_ids, prefix_ids))
+
+    def _infer_stream_ggml(self, prompt_ids: list[int], prefix_ids: list[int]) -> Generator[int, None, None]:
+        """Yield each speech code as llama.cpp samples it."""
+        for token_id in self._generate_ggml(prompt_ids, prefix_ids):
+            for code in _speech_ids_from_token_ids(self._speech_token_table, [token_id]):
+                yield int(code)
 
 
 # ============================================================================
@@ -410,9 +1289,12 @@ class VieNeuTTS:
 # Requires: LMDeploy with CUDA
 # ============================================================================
 
-class FastVieNeuTTS:
+class FastVieNeuTTS(AsyncInferenceMixin):
     """
     GPU-optimized VieNeu-TTS using LMDeploy TurbomindEngine.
+    
+    The asyncio API (`ainfer` / `ainfer_stream` / `ainfer_batch`) runs up to
+    `max_batch_size` requests concurrently, which LMDeploy batches together.
     """
     
     def __init__(
@@ -454,15 +1336,23 @@ class FastVieNeuTTS:
         self.streaming_overlap_frames = 1
         self.streaming_frames_per_chunk = 50
         self.streaming_lookforward = 5
-        self.streaming_lookback = 50
+        self.streaming_lookback = STREAMING_DECODE_CONTEXT_FRAMES
         self.streaming_stride_samples = self.streaming_frames_per_chunk * self.hop_length
+        # Chunk schedule: small first chunk for low time-to-first-audio, then
+        # geometric growth up to streaming_frames_per_chunk
+        self.streaming_first_chunk_frames = 10
+        self.streaming_chunk_growth = 2.0
         
         self.max_batch_size = max_batch_size
+        self.async_max_workers = max_batch_size
         
         self._ref_cache = {}
         
         self.stored_dict = defaultdict(dict)
         
+        # Metrics of the most recent infer_stream call
+        self.last_stream_metrics: StreamMetrics | None = None
+        
         # Flags
         self._is_onnx_codec = False
         self._triton_enabled = False
@@ -498,6 +1388,12 @@ class FastVieNeuTTS:
         
         self.backbone = pipeline(repo, backend_config=backend_config)
         
+        # Vocabulary ID -> codec code, used to decode generated token IDs directly
+        from transformers import AutoTokenizer
+        tokenizer = AutoTokenizer.from_pretrained(repo)
+        self._speech_token_table = _build_speech_token_table(tokenizer)
+        self._prompt_builder = _TextPromptBuilder(lambda text: tokenizer.encode(text, add_special_tokens=False))
+        
         self.gen_config = GenerationConfig(
             top_p=0.95,
             top_k=50,
@@ -561,6 +1457,24 @@ class FastVieNeuTTS:
             ref_codes = self.codec.encode_code(audio_or_path=wav_tensor).squeeze(0).squeeze(0)
         return ref_codes
     
+    def split_text(self, text: str, ref_codes: np.ndarray | torch.Tensor, ref_text: str) -> list[str]:
+        """
+        Split a document into the fewest chunks that fit the context window with
+        this voice: prompt, reference codes and the expected speech tokens.
+        """
+        return list(self.iter_split_text(text, ref_codes, ref_text))
+    
+    def iter_split_text(self, text: str, ref_codes: np.ndarray | torch.Tensor, ref_text: str) -> Iterator[str]:
+        """`split_text` one chunk at a time, running the text frontend only up to that chunk."""
+        return _iter_text_for_context(self._prompt_builder, self.max_context, text, ref_codes, ref_text)
+    
+    def prepare_texts(self, texts: Iterable[str]) -> int:
+        """
+        Normalize and phonemize texts ahead of generation, filling the
+        sentence-level frontend cache. Returns the number of new sentences.
+        """
+        return self._prompt_builder.frontend.prepare(texts, token_ids=False)
+    
     def get_cached_reference(self, voice_name: str, audio_path: str, ref_text: str = None):
         """
         Get or create cached reference codes.
@@ -608,31 +1522,33 @@ class FastVieNeuTTS:
         
         return user_id
     
-    def _decode(self, codes: str):
-        """Decode speech tokens to audio waveform"""
-        speech_ids = [int(num) for num in re.findall(r"<\|speech_(\d+)\|>", codes)]
-        
+    def _decode(self, token_ids) -> np.ndarray:
+        """Decode generated speech token IDs to audio waveform"""
+        return self._decode_codes(_speech_ids_from_token_ids(self._speech_token_table, token_ids))
+    
+    def _decode_codes(self, speech_ids) -> np.ndarray:
+        """Decode integer codec codes to audio waveform"""
         if len(speech_ids) == 0:
             raise ValueError("No valid speech tokens found in output")
         
         if self._is_onnx_codec:
-            codes = np.array(speech_ids, dtype=np.int32)[np.newaxis, np.newaxis, :]
+            codes = np.asarray(speech_ids, dtype=np.int32)[np.newaxis, np.newaxis, :]
             recon = self.codec.decode_code(codes)
         else:
             with torch.no_grad():
-                codes = torch.tensor(speech_ids, dtype=torch.long)[None, None, :].to(
+                codes = torch.as_tensor(np.asarray(speech_ids), dtype=torch.long)[None, None, :].to(
                     self.codec.device
                 )
                 recon = self.codec.decode_code(codes).cpu().numpy()
         
         return recon[0, 0, :]
     
-    def _decode_batch(self, codes_list: list[str], max_workers: int = None):
+    def _decode_batch(self, codes_list: list[list[int]], max_workers: int = None):
         """
-        Decode multiple code strings in parallel.
+        Decode multiple generated token ID lists in parallel.
         
         Args:
-            codes_list: List of code strings to decode
+            codes_list: List of generated token ID lists to decode
             max_workers: Number of parallel workers (auto-tuned if None)
             
         Returns:
@@ -658,18 +1574,8 @@ class FastVieNeuTTS:
         return results
     
     def _format_prompt(self, ref_codes: list[int], ref_text: str, input_text: str) -> str:
-        """Format prompt for LMDeploy"""
-        ref_text_phones = phonemize_with_dict(ref_text)
-        input_text_phones = phonemize_with_dict(input_text)
-        
-        codes_str = "".join([f"<|speech_{idx}|>" for idx in ref_codes])
-        
-        prompt = (
-            f"user: Convert the text to speech:<|TEXT_PROMPT_START|>{ref_text_phones} {input_text_phones}"
-            f"<|TEXT_PROMPT_END|>\nassistant:<|SPEECH_GENERATION_START|>{codes_str}"
-        )
-        
-        return prompt
+        """Format prompt for LMDeploy (voice part cached per reference)"""
+        return self._prompt_builder.build(ref_codes, ref_text, input_text)
     
     def infer(self, text: str, ref_codes: np.ndarray | torch.Tensor, ref_text: str) -> np.ndarray:
         """
@@ -692,21 +1598,20 @@ class FastVieNeuTTS:
         
         # Use LMDeploy pipeline for generation
         responses = self.backbone([prompt], gen_config=self.gen_config, do_preprocess=False)
-        output_str = responses[0].text
         
         # Decode to audio
-        wav = self._decode(output_str)
+        wav = self._decode(responses[0].token_ids)
         
         return wav
     
-    def infer_batch(self, texts: list[str], ref_codes: np.ndarray | torch.Tensor, ref_text: str, max_batch_size: int = None) -> list[np.ndarray]:
+    def infer_batch(self, texts: list[str], ref_codes: np.ndarray | torch.Tensor | list, ref_text: str | list[str], max_batch_size: int = None) -> list[np.ndarray]:
         """
         Batch inference for multiple texts.
         
         Args:
             texts: List of input texts to synthesize
-            ref_codes: Encoded reference audio codes
-            ref_text: Reference text for reference audio
+            ref_codes: Encoded reference audio codes, or a list with the codes for each text
+            ref_text: Reference text for reference audio, or a list with the reference text for each text
             max_batch_size: Maximum chunks to process at once (prevent GPU overload)
             
         Returns:
@@ -718,10 +1623,13 @@ class FastVieNeuTTS:
         if not isinstance(texts, list):
             texts = [texts]
         
-        if isinstance(ref_codes, torch.Tensor):
-            ref_codes = ref_codes.cpu().numpy()
-        if isinstance(ref_codes, np.ndarray):
-            ref_codes = ref_codes.flatten().tolist()
+        # One voice for all texts, or one per text (texts of several requests)
+        if isinstance(ref_text, str):
+            refs = [(_flat_codes(ref_codes), ref_text)] * len(texts)
+        else:
+            refs = [(_flat_codes(codes), text) for codes, text in zip(ref_codes, ref_text)]
+            if len(refs) != len(texts):
+                raise ValueError("ref_codes and ref_text need one entry per text")
         
         all_wavs = []
         
@@ -730,13 +1638,16 @@ class FastVieNeuTTS:
             batch_texts = texts[i:i+max_batch_size]
             
             # Format prompts for this batch
-            prompts = [self._format_prompt(ref_codes, ref_text, text) for text in batch_texts]
+            prompts = [
+                self._format_prompt(codes, voice_text, text)
+                for text, (codes, voice_text) in zip(batch_texts, refs[i:i+max_batch_size])
+            ]
             
             # Batch generation with LMDeploy
             responses = self.backbone(prompts, gen_config=self.gen_config, do_preprocess=False)
             
             # Decode outputs (with smart parallelization)
-            batch_codes = [response.text for response in responses]
+            batch_codes = [response.token_ids for response in responses]
             
             # Auto-tune parallel workers based on batch size
             if len(batch_codes) > 3:
@@ -754,7 +1665,13 @@ class FastVieNeuTTS:
         
         return all_wavs
     
-    def infer_stream(self, text: str, ref_codes: np.ndarray | torch.Tensor, ref_text: str) -> Generator[np.ndarray, None, None]:
+    def infer_stream(
+        self,
+        text: str,
+        ref_codes: np.ndarray | torch.Tensor,
+        ref_text: str,
+        metrics: StreamMetrics | None = None,
+    ) -> Generator[np.ndarray, None, None]:
         """
         Streaming inference with low latency.
         
@@ -762,10 +1679,15 @@ class FastVieNeuTTS:
             text: Input text to synthesize
             ref_codes: Encoded reference audio codes
             ref_text: Reference text for reference audio
+            metrics: Optional StreamMetrics filled with latency metrics while streaming
+                (the latest one is also kept in `last_stream_metrics`)
             
         Yields:
             Audio chunks as numpy arrays
         """
+        metrics = metrics if metrics is not None else StreamMetrics()
+        self.last_stream_metrics = metrics
+        
         if isinstance(ref_codes, torch.Tensor):
             ref_codes = ref_codes.cpu().numpy()
         if isinstance(ref_codes, np.ndarray):
@@ -773,78 +1695,24 @@ class FastVieNeuTTS:
         
         prompt = self._format_prompt(ref_codes, ref_text, text)
         
-        audio_cache = []
-        token_cache = [f"<|speech_{idx}|>" for idx in ref_codes]
-        n_decoded_samples = 0
-        n_decoded_tokens = len(ref_codes)
-        
-        for response in self.backbone.stream_infer([prompt], gen_config=self.gen_config, do_preprocess=False):
-            output_str = response.text
-            
-            # Extract new tokens
-            new_tokens = output_str[len("".join(token_cache[len(ref_codes):])):] if len(token_cache) > len(ref_codes) else output_str
-            
-            if new_tokens:
-                token_cache.append(new_tokens)
-            
-            # Check if we have enough tokens to decode a chunk
-            if len(token_cache[n_decoded_tokens:]) >= self.streaming_frames_per_chunk + self.streaming_lookforward:
-                
-                # Decode chunk with context
-                tokens_start = max(
-                    n_decoded_tokens - self.streaming_lookback - self.streaming_overlap_frames,
-                    0
-                )
-                tokens_end = (
-                    n_decoded_tokens
-                    + self.streaming_frames_per_chunk
-                    + self.streaming_lookforward
-                    + self.streaming_overlap_frames
-                )
-                sample_start = (n_decoded_tokens - tokens_start) * self.hop_length
-                sample_end = (
-                    sample_start
-                    + (self.streaming_frames_per_chunk + 2 * self.streaming_overlap_frames) * self.hop_length
-                )
-                
-                curr_codes = token_cache[tokens_start:tokens_end]
-                recon = self._decode("".join(curr_codes))
-                recon = recon[sample_start:sample_end]
-                audio_cache.append(recon)
+        def new_codes():
+            n_generated = 0
+            for response in self.backbone.stream_infer([prompt], gen_config=self.gen_config, do_preprocess=False):
+                # Only the tokens generated since the previous response are new
+                n_new = response.generate_token_len - n_generated
+                if n_new <= 0 or not response.token_ids:
+                    continue
+                n_generated = response.generate_token_len
                 
-                # Overlap-add processing
-                processed_recon = _linear_overlap_add(
-                    audio_cache, stride=self.streaming_stride_samples
-                )
-                new_samples_end = len(audio_cache) * self.streaming_stride_samples
-                processed_recon = processed_recon[n_decoded_samples:new_samples_end]
-                n_decoded_samples = new_samples_end
-                n_decoded_tokens += self.streaming_frames_per_chunk
-                
-                yield processed_recon
-        
-        # Final chunk
-        remaining_tokens = len(token_cache) - n_decoded_tokens
-        if remaining_tokens > 0:
-            tokens_start = max(
-                len(token_cache) - (self.streaming_lookback + self.streaming_overlap_frames + remaining_tokens),
-                0
-            )
-            sample_start = (
-                len(token_cache) - tokens_start - remaining_tokens - self.streaming_overlap_frames
-            ) * self.hop_length
-            
-            curr_codes = token_cache[tokens_start:]
-            recon = self._decode("".join(curr_codes))
-            recon = recon[sample_start:]
-            audio_cache.append(recon)
-            
-            processed_recon = _linear_overlap_add(audio_cache, stride=self.streaming_stride_samples)
-            processed_recon = processed_recon[n_decoded_samples:]
-            yield processed_recon
+                new_ids = response.token_ids[-n_new:]
+                for code in _speech_ids_from_token_ids(self._speech_token_table, new_ids):
+                    yield int(code)
+        
+        yield from _stream_decode(self, ref_codes, new_codes(), metrics)
     
     def cleanup_memory(self):
         """Clean up GPU memory"""
+        self.shutdown_async_executor()
         if torch.cuda.is_available():
             torch.cuda.empty_cache()
         gc.collect()
@@ -860,7 +1728,10 @@ class FastVieNeuTTS:
         return {
             'triton_enabled': self._triton_enabled,
             'cached_references': len(self._ref_cache),
+            'prompt_cache': self._prompt_builder.stats(),
+            'text_frontend': self._prompt_builder.frontend.stats(),
             'active_sessions': len(self.stored_dict),
             'kv_quant': self.gen_config.__dict__.get('quant_policy', 0),
             'prefix_caching': True,  # Always enabled in our config
+            'last_stream': self.last_stream_metrics.to_dict() if self.last_stream_metrics else None,
         }